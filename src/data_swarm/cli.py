@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import argparse
+import logging
 import uuid
 from pathlib import Path
 
 from data_swarm.config import init_home, load_config
+from data_swarm.llm_telemetry import load_llm_calls, render_llm_stats, summarize_llm_calls
 from data_swarm.orchestrator.runner import run_task
 from data_swarm.orchestrator.task_models import Task
 from data_swarm.projects.meridian_aux.tools.indexer import build_index
+from data_swarm.stores.blob_store import BlobStore
 from data_swarm.stores.task_store import TaskStore
 
 
@@ -29,6 +32,10 @@ def _cmd_task_new(args: argparse.Namespace) -> None:
 
 def _cmd_task_run(args: argparse.Namespace) -> None:
     cfg = load_config()
+    if args.no_llm_cache:
+        llm = dict(cfg.payload.get("llm", {}))
+        llm["cache"] = {**(llm.get("cache") or {}), "bypass": True}
+        cfg.payload["llm"] = llm
     run_task(args.task_id, cfg.payload, cfg.data_swarm_home)
 
 
@@ -45,12 +52,40 @@ def _cmd_task_attach(args: argparse.Namespace) -> None:
     print(f"registered {row['filename']} ({row['sha256'][:8]})")
 
 
-def _cmd_index_build(_: argparse.Namespace) -> None:
+def _cmd_index_build(args: argparse.Namespace) -> None:
     cfg = load_config()
     idx = cfg.data_swarm_home / "indexes" / "meridian" / "index.sqlite"
     paths = cfg.payload["paths"]
-    build_index(idx, [Path(paths["meridian_repo"]), Path(paths["meridian_aux_repo"])])
-    print(f"Index built at {idx}")
+    index_cfg = cfg.payload["meridian_aux"]
+    logging.basicConfig(level=cfg.payload.get("logging", {}).get("level", "INFO"), format="%(message)s")
+    jobs = args.jobs if args.jobs is not None else int(index_cfg.get("index_jobs", 0))
+    stats = build_index(
+        idx,
+        [Path(paths["meridian_repo"]), Path(paths["meridian_aux_repo"])],
+        full=args.full,
+        jobs=jobs,
+        batch_size=int(index_cfg.get("index_batch_size", 5000)),
+        repo_precedence=list(index_cfg.get("repo_precedence") or []),
+    )
+    mode = "full" if args.full else "incremental"
+    print(f"Index built at {idx} ({mode}: " + ", ".join(f"{k}={v}" for k, v in stats.items()) + ")")
+
+
+def _cmd_blobs_gc() -> None:
+    cfg = load_config()
+    stats = BlobStore(cfg.data_swarm_home).gc()
+    print("Blob store GC: " + ", ".join(f"{k}={v}" for k, v in stats.items()))
+
+
+def _cmd_stats_llm(args: argparse.Namespace) -> None:
+    cfg = load_config()
+    calls = load_llm_calls(cfg.data_swarm_home)
+    if args.task_id:
+        calls = [c for c in calls if c.get("task_id") == args.task_id]
+    summary = summarize_llm_calls(calls)
+    if len(summary) > 1:
+        summary += summarize_llm_calls(calls, grouped=False)
+    print(render_llm_stats(summary))
 
 
 def main() -> None:
@@ -68,6 +103,9 @@ def main() -> None:
     new.add_argument("--task-type", default="general")
     run = task_sub.add_parser("run")
     run.add_argument("task_id")
+    run.add_argument(
+        "--no-llm-cache", action="store_true", help="Skip cached LLM responses (fresh ones are still stored)"
+    )
     status = task_sub.add_parser("status")
     status.add_argument("task_id")
     attach = task_sub.add_parser("attach")
@@ -77,7 +115,18 @@ def main() -> None:
 
     index = sub.add_parser("index")
     index_sub = index.add_subparsers(dest="index_cmd", required=True)
-    index_sub.add_parser("build")
+    index_build = index_sub.add_parser("build")
+    index_build.add_argument("--full", action="store_true", help="Drop and rebuild the index from scratch")
+    index_build.add_argument("--jobs", type=int, default=None, help="Parser worker processes (0 = all cores)")
+
+    blobs = sub.add_parser("blobs")
+    blobs_sub = blobs.add_subparsers(dest="blobs_cmd", required=True)
+    blobs_sub.add_parser("gc", help="Delete evidence blobs no task directory references")
+
+    stats = sub.add_parser("stats")
+    stats_sub = stats.add_subparsers(dest="stats_cmd", required=True)
+    stats_llm = stats_sub.add_parser("llm", help="p50/p95 latency and token totals from llm_call events")
+    stats_llm.add_argument("--task-id", default=None, help="Only this task")
 
     args = parser.parse_args()
     if args.cmd == "init":
@@ -92,6 +141,10 @@ def main() -> None:
         _cmd_task_attach(args)
     elif args.cmd == "index" and args.index_cmd == "build":
         _cmd_index_build(args)
+    elif args.cmd == "blobs" and args.blobs_cmd == "gc":
+        _cmd_blobs_gc()
+    elif args.cmd == "stats" and args.stats_cmd == "llm":
+        _cmd_stats_llm(args)
 
 
 if __name__ == "__main__":
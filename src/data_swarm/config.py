@@ -13,7 +13,39 @@ from data_swarm.tools.dotenv import load_dotenv
 
 DEFAULT_CONFIG = {
     "timezone": "Europe/London",
-    "llm": {"provider": "openai", "model": "gpt-4o-mini"},
+    "llm": {
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "mode": "live",
+        "cassette": "",
+        "replay_latency_scale": 0.0,
+        "timeout_seconds": 60,
+        "max_connections": 10,
+        "max_keepalive_connections": 10,
+        "max_retries": 0,
+        "retry": {"max_attempts": 5, "base_delay_seconds": 0.5, "max_delay_seconds": 30},
+        "rate_limits": {
+            "default": {"rpm": 0, "tpm": 0},
+            "gpt-4o-mini": {"rpm": 500, "tpm": 200000},
+            "gpt-4o": {"rpm": 500, "tpm": 30000},
+        },
+        "pricing": {
+            "gpt-4o-mini": {"input_per_mtok": 0.15, "output_per_mtok": 0.6},
+            "gpt-4o": {"input_per_mtok": 2.5, "output_per_mtok": 10.0},
+        },
+        "routing": {
+            "codegen": {
+                "model": "gpt-4o",
+                "timeout_seconds": 120,
+                "max_prompt_tokens": 0,
+                "token_budget": 100000,
+                "fallback_model": "gpt-4o-mini",
+            },
+            "debugger": {"model": "gpt-4o-mini", "timeout_seconds": 60, "max_prompt_tokens": 0, "token_budget": 0},
+        },
+        "stream": True,
+        "cache": {"enabled": False, "ttl_seconds": 604800, "max_mb": 64, "bypass": False},
+    },
     "triage": {
         "default_sensitivity": "internal",
         "risk_flags": ["timeline", "dependency", "stakeholder_alignment"],
@@ -30,7 +62,23 @@ DEFAULT_CONFIG = {
         "political_two_variant": True,
     },
     "privacy": {"persist_identifiers": False, "require_role_mapping": True},
-    "meridian_aux": {"max_files": 25, "max_chars": 60000, "max_debug_iterations": 3},
+    "meridian_aux": {
+        "max_files": 25,
+        "max_chars": 60000,
+        "max_debug_iterations": 3,
+        "speculative_candidates": 0,
+        "speculative_jobs": 0,
+        "index_jobs": 0,
+        "index_batch_size": 5000,
+        "repo_precedence": [],
+        "closure_mode": "ranked",
+        "snippet_mode": "symbols",
+        "evidence_tiers": True,
+        "full_source_max_distance": 1,
+        "max_tokens": 15000,
+        "max_prompt_tokens": 24000,
+        "evidence_store": True,
+    },
     "logging": {"level": "INFO"},
     "safety": {"never_write_outside_repo": True},
 }
@@ -76,6 +124,13 @@ ENV_TEMPLATE = """# Local environment variables for data_swarm
 # OPENAI_API_KEY=
 """
 
+MERIDIAN_AUX_POLICY_CORE = """# Meridian_Aux Policy Core
+
+- Treat meridian as read-only; every change lands in meridian_aux.
+- Match the surrounding module's naming, docstrings and test layout.
+- Prefer the smallest patch that makes the failing check pass; never weaken existing tests.
+"""
+
 KB_TEMPLATE_FILES = [
     "org_units.yaml",
     "role_registry.yaml",
@@ -251,6 +306,21 @@ def _seed_stage_policy_scaffolds(root: Path) -> None:
     for stage_key in ["triage", "planner", "stakeholder", "navigation", "comms", "feedback"]:
         StagePolicyStore(root, stage_key).ensure_scaffold()
 
+
+def _seed_meridian_aux_policy(root: Path) -> None:
+    """Create the meridian_aux policy pack that prefixes codegen and debugger prompts."""
+    store = StagePolicyStore(root, "meridian_aux")
+    store.ensure_scaffold()
+    core = store.root / "core_prompt.md"
+    if core.read_text(encoding="utf-8").strip():
+        return
+    template = detect_repo_root() / "configs" / "meridian_aux_policy" / "core_prompt.md"
+    core.write_text(
+        template.read_text(encoding="utf-8") if template.exists() else MERIDIAN_AUX_POLICY_CORE,
+        encoding="utf-8",
+    )
+
+
 def init_home(home: Path | None = None) -> Config:
     """Create data_swarm home scaffold and default config."""
     root = home or default_data_swarm_home()
@@ -268,6 +338,7 @@ def init_home(home: Path | None = None) -> Config:
     _seed_kb_templates(root)
     _seed_triage_policy_templates(root)
     _seed_stage_policy_scaffolds(root)
+    _seed_meridian_aux_policy(root)
     return load_config(root)
 
 
@@ -30,3 +30,11 @@ def load_stage_policy(home: Path, stage_key: str) -> dict[str, Any]:
         "behaviour_cards": [p.read_text(encoding="utf-8") for p in cards if p.is_file()],
         "decision_trees": [p.read_text(encoding="utf-8") for p in trees if p.is_file()],
     }
+
+
+def render_stage_policy(policy: dict[str, Any]) -> str:
+    """Render a stage policy pack as prompt text in a fixed section order (empty sections are omitted)."""
+    parts = [policy.get("core_prompt") or ""]
+    parts += [f"## Behaviour card\n\n{card}" for card in policy.get("behaviour_cards") or []]
+    parts += [f"## Decision tree\n\n{tree}" for tree in policy.get("decision_trees") or []]
+    return "\n\n".join(p.strip() for p in parts if p.strip())
@@ -2,32 +2,461 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
-from typing import Any
+import threading
+import weakref
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Protocol
+
+from data_swarm.rate_limit import CallPolicy, call_with_retry, call_with_retry_async, is_retryable, shared_limiter
+from data_swarm.tokens import TokenEstimator
+
+if TYPE_CHECKING:
+    from data_swarm.stores.llm_cache import LLMCache
 
 
 class LLMUnavailableError(RuntimeError):
     """Raised when LLM cannot be used."""
 
 
+class Provider(Protocol):
+    """What agents need from an LLM provider."""
+
+    model: str
+
+    def complete(self, prompt: str) -> str:
+        """Return the full completion for ``prompt``."""
+
+
+class LLMTimeoutError(LLMUnavailableError):
+    """Raised when a completion exceeds its per-call timeout."""
+
+
+class LLMTransientError(LLMUnavailableError):
+    """Raised when rate limits or transient errors persist through every retry."""
+
+
+def _api_key() -> str:
+    key = os.environ.get("OPENAI_API_KEY")
+    if not key:
+        raise LLMUnavailableError("OPENAI_API_KEY is not set. Configure DATA_SWARM_HOME/.env or env vars.")
+    return key
+
+
+def _total_tokens(resp: Any) -> int:
+    usage = getattr(resp, "usage", None)
+    return int(getattr(usage, "total_tokens", 0) or 0)
+
+
+@dataclass(frozen=True)
+class ClientSettings:
+    """HTTP settings shared by every client built from the same ``llm`` config."""
+
+    timeout_seconds: float = 60.0
+    max_connections: int = 10
+    max_keepalive_connections: int = 10
+    max_retries: int = 0
+    base_url: str | None = None
+
+    @classmethod
+    def from_config(cls, llm: dict[str, Any] | None) -> ClientSettings:
+        """Build settings from the ``llm`` config section, keeping defaults for missing keys."""
+        llm = llm or {}
+        default = cls()
+        return cls(
+            timeout_seconds=float(llm.get("timeout_seconds", default.timeout_seconds)),
+            max_connections=int(llm.get("max_connections", default.max_connections)),
+            max_keepalive_connections=int(llm.get("max_keepalive_connections", default.max_keepalive_connections)),
+            max_retries=int(llm.get("max_retries", default.max_retries)),
+            base_url=llm.get("base_url") or None,
+        )
+
+
+_LOCK = threading.Lock()
+_CLIENTS: dict[tuple[str, ClientSettings], Any] = {}
+_PROVIDERS: dict[tuple[str, ClientSettings, CallPolicy], OpenAIProvider] = {}
+_ASYNC_CLIENTS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClients] = weakref.WeakKeyDictionary()
+_LOOP: asyncio.AbstractEventLoop | None = None
+_CLOSING: set[asyncio.Task[None]] = set()
+
+
+def _build_client(key: str, settings: ClientSettings) -> Any:
+    try:
+        import httpx
+        from openai import OpenAI
+    except ImportError as exc:
+        raise LLMUnavailableError("Install extras: pip install -e .[openai]") from exc
+    limits = httpx.Limits(
+        max_connections=settings.max_connections,
+        max_keepalive_connections=settings.max_keepalive_connections,
+    )
+    return OpenAI(
+        api_key=key,
+        timeout=settings.timeout_seconds,
+        max_retries=settings.max_retries,
+        base_url=settings.base_url,
+        http_client=httpx.Client(limits=limits, timeout=settings.timeout_seconds),
+    )
+
+
+def _build_async_client(key: str, settings: ClientSettings) -> Any:
+    try:
+        import httpx
+        from openai import AsyncOpenAI
+    except ImportError as exc:
+        raise LLMUnavailableError("Install extras: pip install -e .[openai]") from exc
+    limits = httpx.Limits(
+        max_connections=settings.max_connections,
+        max_keepalive_connections=settings.max_keepalive_connections,
+    )
+    return AsyncOpenAI(
+        api_key=key,
+        timeout=settings.timeout_seconds,
+        max_retries=settings.max_retries,
+        base_url=settings.base_url,
+        http_client=httpx.AsyncClient(limits=limits, timeout=settings.timeout_seconds),
+    )
+
+
+class _LoopClients:
+    """Async clients of one event loop, closed when the loop shuts down its async generators."""
+
+    def __init__(self) -> None:
+        self.clients: dict[tuple[str, ClientSettings], Any] = {}
+        self.closer = _close_on_shutdown(self.clients)
+
+
+async def _aclose_all(clients: dict[tuple[str, ClientSettings], Any]) -> None:
+    while clients:
+        _, client = clients.popitem()
+        close = getattr(client, "aclose", None) or getattr(client, "close", None)
+        if callable(close):
+            await close()
+
+
+async def _close_on_shutdown(clients: dict[tuple[str, ClientSettings], Any]) -> AsyncIterator[None]:
+    # Started on the client's loop, so ``loop.shutdown_asyncgens()`` (run by ``asyncio.run``) finalizes it.
+    try:
+        yield
+    finally:
+        loop = asyncio.get_running_loop()
+        with _LOCK:
+            entry = _ASYNC_CLIENTS.get(loop)
+            if entry is not None and entry.clients is clients:
+                del _ASYNC_CLIENTS[loop]
+        await _aclose_all(clients)
+
+
+async def shared_async_client(key: str, settings: ClientSettings) -> Any:
+    """Return the async client for ``key`` and ``settings`` bound to the running event loop.
+
+    Clients live as long as their loop and are closed when it shuts down
+    its async generators or on :func:`reset_registry`.
+    """
+    loop = asyncio.get_running_loop()
+    with _LOCK:
+        entry = _ASYNC_CLIENTS.get(loop)
+        started = entry is not None
+        if entry is None:
+            entry = _ASYNC_CLIENTS[loop] = _LoopClients()
+        client = entry.clients.get((key, settings))
+        if client is None:
+            client = entry.clients[(key, settings)] = _build_async_client(key, settings)
+    if not started:
+        await entry.closer.asend(None)
+    return client
+
+
+def _close_async_clients(loop: asyncio.AbstractEventLoop, entry: _LoopClients) -> None:
+    if loop.is_closed() or not entry.clients:
+        return
+    try:
+        current = asyncio.get_running_loop()
+    except RuntimeError:
+        current = None
+    if current is loop:
+        _CLOSING.add(task := loop.create_task(_aclose_all(entry.clients)))
+        task.add_done_callback(_CLOSING.discard)
+    elif loop.is_running():
+        asyncio.run_coroutine_threadsafe(_aclose_all(entry.clients), loop).result()
+    else:
+        loop.run_until_complete(_aclose_all(entry.clients))
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Return the daemon event loop that runs async completions for sync callers."""
+    global _LOOP
+    with _LOCK:
+        if _LOOP is None or _LOOP.is_closed():
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_LOOP.run_forever, name="data-swarm-llm", daemon=True).start()
+        return _LOOP
+
+
+def shared_client(key: str, settings: ClientSettings) -> Any:
+    """Return the process-wide client for ``key`` and ``settings``, creating it once."""
+    with _LOCK:
+        client = _CLIENTS.get((key, settings))
+        if client is None:
+            client = _CLIENTS[(key, settings)] = _build_client(key, settings)
+        return client
+
+
+def get_provider(
+    model: str,
+    settings: ClientSettings | None = None,
+    policy: CallPolicy | None = None,
+) -> OpenAIProvider:
+    """Return the process-wide provider for ``model``, ``settings`` and call ``policy``."""
+    settings = settings or ClientSettings()
+    policy = policy or CallPolicy()
+    with _LOCK:
+        provider = _PROVIDERS.get((model, settings, policy))
+        if provider is None:
+            provider = _PROVIDERS[(model, settings, policy)] = OpenAIProvider(model, settings, policy)
+        return provider
+
+
+def reset_registry() -> None:
+    """Close and forget every shared client and provider."""
+    with _LOCK:
+        for client in _CLIENTS.values():
+            close = getattr(client, "close", None)
+            if callable(close):
+                close()
+        _CLIENTS.clear()
+        _PROVIDERS.clear()
+        loops = list(_ASYNC_CLIENTS.items())
+        _ASYNC_CLIENTS.clear()
+    for loop, entry in loops:
+        _close_async_clients(loop, entry)
+
+
 class OpenAIProvider:
-    """Minimal OpenAI provider wrapper."""
+    """Minimal OpenAI provider wrapper.
 
-    def __init__(self, model: str) -> None:
+    Calls wait for the model's shared rate limiter (requests and estimated
+    prompt tokens per minute) and retry rate limits and transient errors with
+    jittered exponential backoff, honoring ``retry-after`` hints.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        settings: ClientSettings | None = None,
+        policy: CallPolicy | None = None,
+        api_key: str | None = None,
+    ) -> None:
         self.model = model
+        self.settings = settings or ClientSettings()
+        self.policy = policy or CallPolicy()
+        self.estimator = TokenEstimator(model)
+        self.api_key = api_key
 
     def _client(self, key: str) -> Any:
+        return shared_client(key, self.settings)
+
+    def _create(self, prompt: str, **kwargs: Any) -> tuple[Any, Callable[[Any], None]]:
+        """Send one request; also return a callback that charges the final response's usage."""
+        client = self._client(self.api_key or _api_key())
+        limiter = shared_limiter(self.model, self.policy)
+        tokens = self.estimator.count(prompt)
+
+        def attempt() -> Any:
+            limiter.acquire(tokens)
+            return client.responses.create(model=self.model, input=prompt, **kwargs)
+
         try:
-            from openai import OpenAI
-        except ImportError as exc:
-            raise LLMUnavailableError("Install extras: pip install -e .[openai]") from exc
-        return OpenAI(api_key=key)
+            resp = call_with_retry(attempt, self.policy)
+        except Exception as exc:
+            if is_retryable(exc):
+                raise LLMTransientError(f"LLM call failed after {self.policy.max_attempts} attempts: {exc}") from exc
+            raise
+        return resp, lambda final: limiter.settle(_total_tokens(final) - tokens)
 
     def complete(self, prompt: str) -> str:
         """Run chat completion with graceful API key handling."""
-        key = os.environ.get("OPENAI_API_KEY")
-        if not key:
-            raise LLMUnavailableError("OPENAI_API_KEY is not set. Configure DATA_SWARM_HOME/.env or env vars.")
-        client = self._client(key)
-        resp = client.responses.create(model=self.model, input=prompt)
+        resp, settle = self._create(prompt)
+        settle(resp)
         return resp.output_text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield output text deltas; usage is charged from ``response.completed`` once the stream ends."""
+        events, settle = self._create(prompt, stream=True)
+        final = None
+        try:
+            for event in events:
+                kind = getattr(event, "type", "")
+                if kind == "response.output_text.delta":
+                    yield event.delta
+                elif kind == "response.completed":
+                    final = event.response
+        finally:
+            settle(final)
+
+
+class AsyncOpenAIProvider:
+    """Async OpenAI provider with bounded concurrent fan-out."""
+
+    def __init__(self, model: str, settings: ClientSettings | None = None, policy: CallPolicy | None = None) -> None:
+        self.model = model
+        self.settings = settings or ClientSettings()
+        self.policy = policy or CallPolicy()
+        self.estimator = TokenEstimator(model)
+
+    async def complete(self, prompt: str) -> str:
+        """Run one completion on the shared async client, rate limited and retried like :class:`OpenAIProvider`."""
+        client = await shared_async_client(_api_key(), self.settings)
+        limiter = shared_limiter(self.model, self.policy)
+        tokens = self.estimator.count(prompt)
+
+        async def attempt() -> Any:
+            await limiter.acquire_async(tokens)
+            return await client.responses.create(model=self.model, input=prompt)
+
+        try:
+            resp = await call_with_retry_async(attempt, self.policy)
+        except Exception as exc:
+            if is_retryable(exc):
+                raise LLMTransientError(f"LLM call failed after {self.policy.max_attempts} attempts: {exc}") from exc
+            raise
+        limiter.settle(_total_tokens(resp) - tokens)
+        return resp.output_text
+
+    async def _bounded(self, prompt: str, semaphore: asyncio.Semaphore, timeout: float | None) -> str:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(self.complete(prompt), timeout)
+            except asyncio.TimeoutError as exc:
+                raise LLMTimeoutError(f"LLM call exceeded {timeout}s") from exc
+
+    async def complete_many(
+        self,
+        prompts: Sequence[str],
+        max_concurrency: int = 4,
+        timeout: float | None = None,
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        """Complete ``prompts`` with at most ``max_concurrency`` in flight, results in prompt order.
+
+        Each call is limited to ``timeout`` seconds (default: the client
+        timeout). Unless ``return_exceptions`` is set, the first failure
+        cancels the calls still pending and is raised.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        limit = self.settings.timeout_seconds if timeout is None else timeout
+        tasks = [asyncio.ensure_future(self._bounded(p, semaphore, limit)) for p in prompts]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+class SyncFacade:
+    """Blocking ``complete``/``complete_many`` over an :class:`AsyncOpenAIProvider`.
+
+    Coroutines run on a shared background event loop so async clients and
+    their connections survive between calls.
+    """
+
+    def __init__(self, provider: AsyncOpenAIProvider) -> None:
+        self.provider = provider
+
+    @property
+    def model(self) -> str:
+        """Return the wrapped provider's model."""
+        return self.provider.model
+
+    def _run(self, coro: Any) -> Any:
+        future = asyncio.run_coroutine_threadsafe(coro, _background_loop())
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+    def complete(self, prompt: str) -> str:
+        """Run one completion and wait for it."""
+        return self._run(self.provider.complete_many([prompt]))[0]
+
+    def complete_many(
+        self,
+        prompts: Sequence[str],
+        max_concurrency: int = 4,
+        timeout: float | None = None,
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        """Blocking :meth:`AsyncOpenAIProvider.complete_many`."""
+        return self._run(self.provider.complete_many(prompts, max_concurrency, timeout, return_exceptions))
+
+
+class CachedProvider:
+    """Serve completions from an :class:`LLMCache`, calling the wrapped provider on a miss.
+
+    ``on_lookup(outcome, counters)`` is called after every completion with
+    ``hit``, ``miss`` or ``bypass`` and the cache's running counters; the
+    outcome of the calling thread's latest call is also kept in
+    ``last_outcome`` (``None`` while a call runs or after it failed).
+    ``params`` are the call options the wrapped provider runs with and are
+    part of every cache key.
+    """
+
+    def __init__(
+        self,
+        provider: Provider,
+        cache: LLMCache,
+        on_lookup: Callable[[str, dict[str, int]], None] | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> None:
+        self.provider = provider
+        self.cache = cache
+        self.on_lookup = on_lookup
+        self.params = params or {}
+        self._local = threading.local()
+
+    @property
+    def last_outcome(self) -> str | None:
+        """Return the cache outcome of this thread's latest completed call."""
+        return getattr(self._local, "outcome", None)
+
+    @property
+    def model(self) -> str:
+        """Return the wrapped provider's model."""
+        return self.provider.model
+
+    def complete(self, prompt: str) -> str:
+        """Return the cached response for ``prompt`` or complete and store it."""
+        self._local.outcome = None
+        cached = self.cache.get(self.model, prompt, self.params)
+        outcome = "bypass" if self.cache.bypass else "miss"
+        if cached is not None:
+            outcome, text = "hit", cached
+        else:
+            text = self.provider.complete(prompt)
+            self.cache.put(self.model, prompt, text, self.params)
+        self._local.outcome = outcome
+        if self.on_lookup is not None:
+            self.on_lookup(outcome, dict(self.cache.counters))
+        return text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield the cached response in one piece, or stream the wrapped provider and store the result."""
+        self._local.outcome = None
+        cached = self.cache.get(self.model, prompt, self.params)
+        if cached is not None:
+            self._local.outcome = "hit"
+            if self.on_lookup is not None:
+                self.on_lookup("hit", dict(self.cache.counters))
+            yield cached
+            return
+        parts: list[str] = []
+        for delta in self.provider.stream(prompt):
+            parts.append(delta)
+            yield delta
+        self.cache.put(self.model, prompt, "".join(parts), self.params)
+        self._local.outcome = "bypass" if self.cache.bypass else "miss"
+        if self.on_lookup is not None:
+            self.on_lookup(self._local.outcome, dict(self.cache.counters))
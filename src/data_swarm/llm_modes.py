@@ -0,0 +1,237 @@
+"""Record, replay and fake LLM provider modes for offline runs and benchmarks."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from data_swarm.llm import ClientSettings, LLMUnavailableError, OpenAIProvider, Provider
+from data_swarm.rate_limit import CallPolicy
+from data_swarm.stores.llm_cache import cache_key
+from data_swarm.tokens import TokenEstimator
+
+MODES = ("live", "record", "replay", "fake")
+# Modes that must see every call: a cache hit would never reach the recorder, and replay/fake timings stay real.
+UNCACHED_MODES = ("record", "replay", "fake")
+STREAM_CHUNK_CHARS = 64
+
+
+def cassette_path(home: Path, cassette: str) -> Path:
+    """Resolve ``llm.cassette``: absolute paths as-is, names under ``DATA_SWARM_HOME/cassettes``."""
+    path = Path(cassette).expanduser()
+    if not path.is_absolute():
+        path = home / "cassettes" / path
+    return path if path.suffix else path.with_suffix(".jsonl")
+
+
+class RecordingProvider:
+    """Pass calls through to ``provider`` and append prompt/response pairs with latency to a cassette."""
+
+    def __init__(self, provider: Provider, path: Path) -> None:
+        self.provider = provider
+        self.path = path
+        self.model = provider.model
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _write(self, prompt: str, response: str, latency: float, first_token: float | None = None) -> None:
+        row = {
+            "key": cache_key(self.model, prompt),
+            "model": self.model,
+            "prompt_sha256": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "response": response,
+            "latency_seconds": round(latency, 6),
+            "first_token_seconds": None if first_token is None else round(first_token, 6),
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock, self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(row) + "\n")
+
+    def complete(self, prompt: str) -> str:
+        """Complete through the wrapped provider and record the pair."""
+        start = time.perf_counter()
+        text = self.provider.complete(prompt)
+        self._write(prompt, text, time.perf_counter() - start)
+        return text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Stream through the wrapped provider and record the assembled response."""
+        start = time.perf_counter()
+        first: float | None = None
+        parts: list[str] = []
+        if hasattr(self.provider, "stream"):
+            source = self.provider.stream(prompt)
+        else:
+            source = iter([self.provider.complete(prompt)])
+        for delta in source:
+            if first is None:
+                first = time.perf_counter() - start
+            parts.append(delta)
+            yield delta
+        self._write(prompt, "".join(parts), time.perf_counter() - start, first)
+
+
+class ReplayProvider:
+    """Serve responses from a cassette, optionally sleeping the recorded latency times ``latency_scale``."""
+
+    def __init__(self, path: Path, model: str, latency_scale: float = 0.0) -> None:
+        self.path = path
+        self.model = model
+        self.latency_scale = latency_scale
+        self.entries: dict[str, dict[str, Any]] = {}
+        lines = path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+        for line in lines:
+            if line.strip():
+                row = json.loads(line)
+                self.entries[row["key"]] = row
+
+    def _entry(self, prompt: str) -> dict[str, Any]:
+        if not self.path.exists():
+            raise LLMUnavailableError(f"Cassette not found: {self.path}")
+        row = self.entries.get(cache_key(self.model, prompt))
+        if row is None:
+            raise LLMUnavailableError(f"No cassette entry for this prompt in {self.path.name}")
+        return row
+
+    def complete(self, prompt: str) -> str:
+        """Return the recorded response."""
+        row = self._entry(prompt)
+        if self.latency_scale > 0:
+            time.sleep(float(row.get("latency_seconds") or 0) * self.latency_scale)
+        return row["response"]
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield the recorded response in chunks, spreading the recorded latency after the first token."""
+        row = self._entry(prompt)
+        text = row["response"]
+        chunks = [text[i : i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)] or [""]
+        total = float(row.get("latency_seconds") or 0) * self.latency_scale
+        first = min(total, float(row.get("first_token_seconds") or 0) * self.latency_scale)
+        if first > 0:
+            time.sleep(first)
+        for i, chunk in enumerate(chunks):
+            if i and total > first:
+                time.sleep((total - first) / max(len(chunks) - 1, 1))
+            yield chunk
+
+
+def fake_response(model: str, prompt: str) -> str:
+    """Deterministic YAML payload with the keys the codegen and debugger agents read."""
+    digest = hashlib.sha256(f"{model}\n{prompt}".encode()).hexdigest()[:12]
+    return f'patch: ""\ntests_added: []\nsnippet: ""\nprobe_snippet: ""\nnotes: "fake response {digest}"\n'
+
+
+class _FakeResponsesHandler(BaseHTTPRequestHandler):
+    """Minimal ``POST /v1/responses`` endpoint, JSON or server-sent events."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        if not self.path.rstrip("/").endswith("/responses"):
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("content-length") or 0)) or b"{}")
+        model = str(body.get("model", ""))
+        prompt = body.get("input", "")
+        prompt = prompt if isinstance(prompt, str) else json.dumps(prompt, sort_keys=True)
+        text = fake_response(model, prompt)
+        estimator = TokenEstimator(model)
+        usage = {"input_tokens": estimator.count(prompt), "output_tokens": estimator.count(text)}
+        usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+        response = {
+            "id": "resp_" + hashlib.sha256(text.encode()).hexdigest()[:24],
+            "object": "response",
+            "created_at": 0,
+            "model": model,
+            "status": "completed",
+            "output": [
+                {
+                    "type": "message",
+                    "id": "msg_fake",
+                    "role": "assistant",
+                    "status": "completed",
+                    "content": [{"type": "output_text", "text": text, "annotations": []}],
+                }
+            ],
+            "usage": usage,
+        }
+        if body.get("stream"):
+            events = [{"type": "response.created", "response": {**response, "status": "in_progress", "output": []}}]
+            delta = {"type": "response.output_text.delta", "item_id": "msg_fake", "output_index": 0, "content_index": 0}
+            events += [
+                {**delta, "delta": text[i : i + STREAM_CHUNK_CHARS]} for i in range(0, len(text), STREAM_CHUNK_CHARS)
+            ]
+            events.append({"type": "response.completed", "response": response})
+            payload = "".join(
+                f"event: {e['type']}\ndata: {json.dumps({**e, 'sequence_number': n})}\n\n" for n, e in enumerate(events)
+            ).encode()
+            content_type = "text/event-stream"
+        else:
+            payload = json.dumps(response).encode()
+            content_type = "application/json"
+        self.send_response(200)
+        self.send_header("content-type", content_type)
+        self.send_header("content-length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class FakeLLMServer:
+    """Deterministic local stand-in for the OpenAI Responses API, served from a daemon thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.server = ThreadingHTTPServer((host, port), _FakeResponsesHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="data-swarm-fake-llm", daemon=True).start()
+
+    @property
+    def base_url(self) -> str:
+        """Return the ``/v1`` base URL for OpenAI clients."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def close(self) -> None:
+        """Stop serving."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+_FAKE_LOCK = threading.Lock()
+_FAKE_SERVER: FakeLLMServer | None = None
+
+
+def shared_fake_server() -> FakeLLMServer:
+    """Return the process-wide fake server, starting it on first use."""
+    global _FAKE_SERVER
+    with _FAKE_LOCK:
+        if _FAKE_SERVER is None:
+            _FAKE_SERVER = FakeLLMServer()
+        return _FAKE_SERVER
+
+
+def provider_for_mode(live: Provider, llm: dict[str, Any], home: Path) -> Provider:
+    """Wrap or replace the ``live`` provider according to ``llm.mode``."""
+    mode = str(llm.get("mode") or "live")
+    if mode not in MODES:
+        raise ValueError(f"Unknown llm.mode {mode!r}; expected one of {', '.join(MODES)}")
+    if mode == "live":
+        return live
+    if mode == "fake":
+        settings = ClientSettings.from_config({**llm, "base_url": shared_fake_server().base_url})
+        return OpenAIProvider(live.model, settings, CallPolicy(), api_key="fake")
+    if not llm.get("cassette"):
+        raise ValueError(f"llm.mode {mode!r} needs llm.cassette")
+    path = cassette_path(home, str(llm["cassette"]))
+    if mode == "record":
+        return RecordingProvider(live, path)
+    return ReplayProvider(path, live.model, float(llm.get("replay_latency_scale", 0.0)))
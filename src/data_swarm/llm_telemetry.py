@@ -0,0 +1,193 @@
+"""Per-call LLM telemetry (``llm_call`` events) and cross-task aggregation."""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+from data_swarm.llm import Provider
+from data_swarm.prompting import AssembledPrompt
+from data_swarm.tokens import TokenEstimator
+
+LLM_CALL_EVENT = "llm_call"
+
+
+def call_cost(pricing: dict[str, Any] | None, model: str, prompt_tokens: int, completion_tokens: int) -> float | None:
+    """Return USD cost from ``llm.pricing[model]`` (per million tokens), or ``None`` when unpriced."""
+    price = (pricing or {}).get(model)
+    if not price:
+        return None
+    input_cost = prompt_tokens * float(price.get("input_per_mtok", 0))
+    return (input_cost + completion_tokens * float(price.get("output_per_mtok", 0))) / 1_000_000
+
+
+class InstrumentedProvider:
+    """Report every completion of the wrapped provider to ``emit(data)``.
+
+    ``data`` holds model, agent, estimated prompt/completion tokens, time to
+    first token, total latency, streamed flag, cache hit (when the wrapped
+    provider has a response cache; ``None`` for failed calls), cost when
+    priced, the error type when the call failed, and for
+    :class:`AssembledPrompt` prompts the stable-prefix tokens and
+    cached-prefix ratio.
+    """
+
+    def __init__(
+        self,
+        provider: Provider,
+        agent: str,
+        emit: Callable[[dict[str, Any]], None],
+        pricing: dict[str, Any] | None = None,
+    ) -> None:
+        self.provider = provider
+        self.agent = agent
+        self.emit = emit
+        self.pricing = pricing
+        self.model = provider.model
+        self.estimator = TokenEstimator(provider.model)
+
+    def _report(
+        self,
+        prompt: str,
+        text: str,
+        start: float,
+        first: float | None,
+        streamed: bool,
+        error: str = "",
+    ) -> None:
+        latency = time.perf_counter() - start
+        prompt_tokens = self.estimator.count(prompt)
+        completion_tokens = self.estimator.count(text) if text else 0
+        outcome = None if error else getattr(self.provider, "last_outcome", None)
+        data: dict[str, Any] = {
+            "model": self.model,
+            "agent": self.agent,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "ttft_seconds": round(latency if first is None else first, 6),
+            "latency_seconds": round(latency, 6),
+            "streamed": streamed,
+            "cache_hit": None if outcome is None else outcome == "hit",
+            "cost_usd": call_cost(self.pricing, self.model, prompt_tokens, completion_tokens),
+        }
+        if isinstance(prompt, AssembledPrompt):
+            data["prefix_hash"] = prompt.prefix_hash[:16]
+            data["prefix_tokens"] = prompt.prefix_tokens
+            data["cached_prefix_ratio"] = round(prompt.cached_prefix_ratio, 4)
+        if error:
+            data["error"] = error
+        self.emit(data)
+
+    def complete(self, prompt: str) -> str:
+        """Complete through the wrapped provider and report the call."""
+        start = time.perf_counter()
+        try:
+            text = self.provider.complete(prompt)
+        except Exception as exc:
+            self._report(prompt, "", start, None, False, type(exc).__name__)
+            raise
+        self._report(prompt, text, start, None, False)
+        return text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Stream through the wrapped provider and report the call, including time to first token."""
+        start = time.perf_counter()
+        first: float | None = None
+        parts: list[str] = []
+        try:
+            if hasattr(self.provider, "stream"):
+                source = self.provider.stream(prompt)
+            else:
+                source = iter([self.provider.complete(prompt)])
+            for delta in source:
+                if first is None:
+                    first = time.perf_counter() - start
+                parts.append(delta)
+                yield delta
+        except Exception as exc:
+            self._report(prompt, "".join(parts), start, first, True, type(exc).__name__)
+            raise
+        self._report(prompt, "".join(parts), start, first, True)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def load_llm_calls(home: Path) -> list[dict[str, Any]]:
+    """Return ``llm_call`` events from every task's ``08_logs/events.jsonl`` under ``home``."""
+    rows: list[dict[str, Any]] = []
+    for path in sorted((home / "tasks").glob("*/08_logs/events.jsonl")):
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if LLM_CALL_EVENT not in line:
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event.get("event_type") == LLM_CALL_EVENT:
+                rows.append({"task_id": event.get("task_id"), "stage": event.get("stage"), **event.get("data", {})})
+    return rows
+
+
+def summarize_llm_calls(calls: list[dict[str, Any]], grouped: bool = True) -> list[dict[str, Any]]:
+    """Aggregate calls per (model, agent), or into one ``all`` row.
+
+    Rows hold count, p50/p95 latency and TTFT, token and cost totals, and
+    the mean cached-prefix ratio.
+    """
+    groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for call in calls:
+        key = (str(call.get("model", "")), str(call.get("agent", ""))) if grouped else ("all", "all")
+        groups.setdefault(key, []).append(call)
+    out: list[dict[str, Any]] = []
+    for (model, agent), rows in sorted(groups.items()):
+        latency = [float(r.get("latency_seconds") or 0) for r in rows]
+        ttft = [float(r.get("ttft_seconds") or 0) for r in rows]
+        costs = [r["cost_usd"] for r in rows if r.get("cost_usd") is not None]
+        ratios = [float(r["cached_prefix_ratio"]) for r in rows if r.get("cached_prefix_ratio") is not None]
+        out.append(
+            {
+                "model": model,
+                "agent": agent,
+                "calls": len(rows),
+                "errors": sum(1 for r in rows if r.get("error")),
+                "cache_hits": sum(1 for r in rows if r.get("cache_hit")),
+                "p50_latency_seconds": percentile(latency, 50),
+                "p95_latency_seconds": percentile(latency, 95),
+                "p50_ttft_seconds": percentile(ttft, 50),
+                "prompt_tokens": sum(int(r.get("prompt_tokens") or 0) for r in rows),
+                "completion_tokens": sum(int(r.get("completion_tokens") or 0) for r in rows),
+                "cost_usd": sum(costs) if costs else None,
+                "cached_prefix_ratio": sum(ratios) / len(ratios) if ratios else None,
+            }
+        )
+    return out
+
+
+def render_llm_stats(summary: list[dict[str, Any]]) -> str:
+    """Render the per-model/agent summary as a plain-text table."""
+    if not summary:
+        return "No llm_call events found."
+    lines = [
+        f"{'model':<20} {'agent':<10} {'calls':>5} {'p50 s':>7} {'p95 s':>7} {'ttft50':>7} "
+        f"{'in tok':>8} {'out tok':>8} {'hits':>4} {'prefix':>6} {'cost $':>8}"
+    ]
+    for row in summary:
+        cost = "-" if row["cost_usd"] is None else f"{row['cost_usd']:.4f}"
+        ratio = row.get("cached_prefix_ratio")
+        prefix = "-" if ratio is None else f"{ratio:.0%}"
+        lines.append(
+            f"{row['model']:<20} {row['agent']:<10} {row['calls']:>5} {row['p50_latency_seconds']:>7.2f} "
+            f"{row['p95_latency_seconds']:>7.2f} {row['p50_ttft_seconds']:>7.2f} {row['prompt_tokens']:>8} "
+            f"{row['completion_tokens']:>8} {row['cache_hits']:>4} {prefix:>6} {cost:>8}"
+        )
+    return "\n".join(lines)
@@ -3,24 +3,83 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 import yaml
 
-from data_swarm.llm import LLMUnavailableError, OpenAIProvider
+from data_swarm.llm import ClientSettings, LLMUnavailableError, Provider, get_provider
+from data_swarm.projects.meridian_aux.tools.stream_parser import SectionStreamParser
+from data_swarm.prompting import AssembledPrompt, PromptAssembler
+from data_swarm.tokens import TokenEstimator
+
+CODEGEN_KEYS = ("patch", "tests_added", "snippet", "notes")
 
 
 class CodegenAgent:
     """Generate patch/tests/snippets using provider output."""
 
-    def __init__(self, model: str) -> None:
-        self.provider = OpenAIProvider(model)
+    def __init__(
+        self,
+        model: str,
+        max_tokens: int | None = None,
+        settings: ClientSettings | None = None,
+        provider: Provider | None = None,
+        policy: dict[str, Any] | None = None,
+    ) -> None:
+        self.provider = provider or get_provider(model, settings)
+        self.estimator = TokenEstimator(model)
+        self.assembler = PromptAssembler(model)
+        self.max_tokens = max_tokens
+        self.policy = policy
+
+    def assemble(self, prompt_path: Path, context: str, evidence: list[Path] | None = None) -> AssembledPrompt:
+        """Build the prompt: instructions and policy pack as a stable prefix, then context and evidence snippets.
+
+        With ``max_tokens`` the context is truncated to what the prefix
+        leaves over and snippets that no longer fit are skipped.
+        """
+        system = prompt_path.read_text(encoding="utf-8")
+        snippets = [f"## Evidence: {p.name}\n\n{p.read_text(encoding='utf-8')}" for p in evidence or []]
+        if not self.max_tokens:
+            return self.assembler.assemble(system, [context, *snippets], self.policy)
+        used = self.estimator.count(self.assembler.prefix(system, self.policy))
+        context = self.estimator.truncate(context, max(self.max_tokens - used, 0))
+        variable = [context]
+        used += self.estimator.count(context)
+        for snippet in snippets:
+            cost = self.estimator.count("\n\n" + snippet)
+            if used + cost <= self.max_tokens:
+                variable.append(snippet)
+                used += cost
+        return self.assembler.assemble(system, variable, self.policy)
+
+    def generate(
+        self,
+        prompt_path: Path,
+        context: str,
+        evidence: list[Path] | None = None,
+        on_section: Callable[[str, Any], None] | None = None,
+    ) -> dict:
+        """Generate machine-parseable payload.
 
-    def generate(self, prompt_path: Path, context: str) -> dict:
-        """Generate machine-parseable payload."""
-        prompt = prompt_path.read_text(encoding="utf-8") + "\n\n" + context
+        With ``on_section`` the response is streamed and each of ``patch``,
+        ``tests_added``, ``snippet`` and ``notes`` is reported as soon as it
+        completes.
+        """
+        prompt = self.assemble(prompt_path, context, evidence)
         try:
-            text = self.provider.complete(prompt)
+            if on_section is not None and hasattr(self.provider, "stream"):
+                parser = SectionStreamParser(CODEGEN_KEYS, on_section)
+                parts: list[str] = []
+                for delta in self.provider.stream(prompt):
+                    parts.append(delta)
+                    parser.feed(delta)
+                parser.close()
+                text = "".join(parts)
+            else:
+                text = self.provider.complete(prompt)
         except LLMUnavailableError as exc:
             return {
                 "patch": "",
@@ -3,22 +3,31 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
 import yaml
 
-from data_swarm.llm import LLMUnavailableError, OpenAIProvider
+from data_swarm.llm import ClientSettings, LLMUnavailableError, Provider, get_provider
+from data_swarm.prompting import PromptAssembler
 
 
 class DebuggerAgent:
     """Propose bounded debug patch outputs."""
 
-    def __init__(self, model: str) -> None:
-        self.provider = OpenAIProvider(model)
+    def __init__(
+        self,
+        model: str,
+        settings: ClientSettings | None = None,
+        provider: Provider | None = None,
+        policy: dict[str, Any] | None = None,
+    ) -> None:
+        self.provider = provider or get_provider(model, settings)
+        self.assembler = PromptAssembler(model)
+        self.policy = policy
 
-    def propose(self, prompt_path: Path, context: str) -> dict[str, str]:
-        """Return patch, probe snippet, and notes."""
-        prompt = prompt_path.read_text(encoding="utf-8") + "\n\n" + context
+    def _complete(self, prompt: str) -> dict[str, str]:
         try:
             text = self.provider.complete(prompt)
         except LLMUnavailableError as exc:
@@ -32,3 +41,33 @@ class DebuggerAgent:
             "probe_snippet": payload.get("probe_snippet", ""),
             "notes": payload.get("notes", ""),
         }
+
+    def propose(self, prompt_path: Path, context: str, task_context: str = "") -> dict[str, str]:
+        """Return patch, probe snippet, and notes.
+
+        ``task_context`` stays the same across iterations and joins the stable
+        prompt prefix; ``context`` (the latest traceback) goes last.
+        """
+        system = prompt_path.read_text(encoding="utf-8")
+        return self._complete(self.assembler.assemble(system, [context], self.policy, [task_context]))
+
+    def propose_many(
+        self,
+        prompt_path: Path,
+        context: str,
+        count: int,
+        task_context: str = "",
+    ) -> list[dict[str, str]]:
+        """Request ``count`` independent candidates concurrently, each asked for a distinct approach."""
+        system = prompt_path.read_text(encoding="utf-8")
+        prompts = [
+            self.assembler.assemble(
+                system,
+                [context, f"Candidate {i} of {count}: propose a fix that differs from the other candidates."],
+                self.policy,
+                [task_context],
+            )
+            for i in range(1, count + 1)
+        ]
+        with ThreadPoolExecutor(max_workers=max(count, 1)) as pool:
+            return list(pool.map(self._complete, prompts))
@@ -2,13 +2,28 @@
 
 from __future__ import annotations
 
-from data_swarm.projects.meridian_aux.tools.indexer import search_index
+from data_swarm.projects.meridian_aux.tools.query_planner import fused_search, plan_query
 
 
 class NavigatorAgent:
     """Identify likely file entrypoints from index."""
 
-    def decide(self, index_path, query: str) -> dict:
-        """Return simple navigation decision."""
-        hits = search_index(index_path, query, limit=5)
-        return {"entrypoints": hits, "reason": "Top symbol/file matches for task query."}
+    def decide(self, index_path, query: str, limit: int = 5) -> dict:
+        """Return top files for the task description, one best-scoring symbol per file."""
+        plan = plan_query(index_path, query)
+        hits = fused_search(index_path, query, limit=limit * 4, plan=plan)
+        entrypoints: list[dict[str, str]] = []
+        files: set[tuple[str, str]] = set()
+        for hit in hits:
+            key = (hit["repo"], hit["file_path"])
+            if key in files:
+                continue
+            files.add(key)
+            entrypoints.append(hit)
+            if len(entrypoints) >= limit:
+                break
+        return {
+            "entrypoints": entrypoints,
+            "query_terms": [{"term": t.text, "idf": round(t.weight, 4)} for t in plan.terms],
+            "reason": "Reciprocal rank fusion of IDF-weighted keyword sub-queries over the symbol index.",
+        }
@@ -4,7 +4,15 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from data_swarm.projects.meridian_aux.tools.retriever import RepoFile, collect_snippets
+from data_swarm.projects.meridian_aux.tools.retriever import (
+    RepoFile,
+    collect_snippets,
+    file_digests,
+    relevant_symbols,
+    symbol_spans,
+)
+from data_swarm.stores.blob_store import BlobStore
+from data_swarm.tokens import TokenEstimator
 
 
 class RetrieverAgent:
@@ -16,6 +24,33 @@ class RetrieverAgent:
         files: list[RepoFile],
         out_dir: Path,
         max_chars: int,
-    ) -> tuple[list[Path], int]:
-        """Retrieve snippets."""
-        return collect_snippets(repos, files, out_dir, max_chars)
+        index_path: Path | None = None,
+        hits: list[dict[str, str]] | None = None,
+        values: dict[RepoFile, float] | None = None,
+        report_path: Path | None = None,
+        tiers: dict[RepoFile, str] | None = None,
+        max_tokens: int | None = None,
+        estimator: TokenEstimator | None = None,
+        store: BlobStore | None = None,
+    ) -> tuple[list[Path], int, dict[Path, RepoFile]]:
+        """Retrieve snippets packed by relevance; with ``index_path`` extract only relevant symbols per file.
+
+        Returns the snippet paths, their total characters and each snippet's source ``(repo, path)``.
+        """
+        focus = relevant_symbols(index_path, files, hits) if index_path is not None else None
+        spans = symbol_spans(index_path, files) if index_path is not None else None
+        return collect_snippets(
+            repos,
+            files,
+            out_dir,
+            max_chars,
+            focus=focus,
+            spans=spans,
+            values=values,
+            report_path=report_path,
+            tiers=tiers,
+            max_tokens=max_tokens,
+            estimator=estimator,
+            store=store,
+            digests=file_digests(index_path, files) if index_path is not None and store is not None else None,
+        )
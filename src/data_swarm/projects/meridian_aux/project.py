@@ -3,17 +3,34 @@
 from __future__ import annotations
 
 import json
+from dataclasses import asdict
 from pathlib import Path
 
+from data_swarm.kb import load_stage_policy
+from data_swarm.llm import CachedProvider, ClientSettings, Provider, get_provider
+from data_swarm.llm_modes import UNCACHED_MODES, provider_for_mode
+from data_swarm.llm_telemetry import LLM_CALL_EVENT, InstrumentedProvider
 from data_swarm.orchestrator.hitl import approve
 from data_swarm.orchestrator.task_models import Task
 from data_swarm.projects.meridian_aux.agents.codegen import CodegenAgent
 from data_swarm.projects.meridian_aux.agents.debugger import DebuggerAgent
 from data_swarm.projects.meridian_aux.agents.navigator import NavigatorAgent
 from data_swarm.projects.meridian_aux.agents.retriever import RetrieverAgent
-from data_swarm.projects.meridian_aux.tools.dependency_closure import dependency_closure
+from data_swarm.projects.meridian_aux.tools.dependency_closure import (
+    closure_distances,
+    dependency_closure,
+    ranked_dependency_closure,
+)
 from data_swarm.projects.meridian_aux.tools.indexer import build_index
+from data_swarm.projects.meridian_aux.tools.retriever import FULL_TIER, assign_tiers
+from data_swarm.projects.meridian_aux.tools.speculative import CandidateResult, evaluate_candidates, rank_passing
 from data_swarm.projects.meridian_aux.tools.test_runner import run_pytest, run_snippet
+from data_swarm.rate_limit import CallPolicy
+from data_swarm.routing import Route, RoutedProvider
+from data_swarm.stores.blob_store import BlobStore
+from data_swarm.stores.llm_cache import LLMCache
+from data_swarm.stores.log_store import LogStore
+from data_swarm.tokens import TokenEstimator
 from data_swarm.tools.diff import apply_patch_safe, summarize_patch
 from data_swarm.tools.io import UserIO
 
@@ -29,6 +46,89 @@ class MeridianAuxProject:
         summary = summarize_patch(patch)
         return f"files={summary['files']} +{summary['added']} -{summary['removed']}"
 
+    def _provider(
+        self,
+        task: Task,
+        task_dir: Path,
+        model: str,
+        timeout_seconds: float,
+        cached: bool = True,
+    ) -> Provider:
+        """Return the provider for ``llm.mode``.
+
+        Live calls go through the response cache when
+        ``llm.cache.enabled`` is set and ``cached`` is true; roles whose
+        prompts repeat inside a feedback loop (the debugger) pass ``False``.
+        """
+        llm_cfg = self.config["llm"]
+        home = Path(self.config["data_swarm_home"])
+        settings = ClientSettings.from_config({**llm_cfg, "timeout_seconds": timeout_seconds})
+        live = get_provider(model, settings, CallPolicy.from_config(llm_cfg, model))
+        provider = provider_for_mode(live, llm_cfg, home)
+        cache_cfg = llm_cfg.get("cache") or {}
+        if not cached or not cache_cfg.get("enabled", False) or llm_cfg.get("mode", "live") in UNCACHED_MODES:
+            return provider
+        logs = LogStore(task_dir)
+
+        def on_lookup(outcome: str, counters: dict[str, int]) -> None:
+            data = {"model": model, "outcome": outcome, **counters}
+            logs.event(task.task_id, "deliverable", "llm_cache", f"LLM cache {outcome}", data)
+
+        params = {"timeout_seconds": timeout_seconds}
+        return CachedProvider(provider, LLMCache.from_config(home, cache_cfg), on_lookup, params)
+
+    @staticmethod
+    def _file_line(
+        item: tuple[str, str],
+        scores: dict[tuple[str, str], float],
+        tiers: dict[tuple[str, str], str],
+        distances: dict[tuple[str, str], int],
+    ) -> str:
+        details = []
+        if item in tiers:
+            details.append(f"tier {tiers[item]}")
+        if item in distances:
+            details.append(f"distance {distances[item]}")
+        if item in scores:
+            details.append(f"score {scores[item]:.4f}")
+        return f"- {item[0]}/{item[1]}" + (f" ({', '.join(details)})" if details else "")
+
+    def _speculative_debug(
+        self,
+        debugger: DebuggerAgent,
+        traceback: str,
+        context: str,
+        repo: Path,
+        snippet: Path,
+        workdir: Path,
+    ) -> CandidateResult | None:
+        """Test ``speculative_candidates`` debug patches in parallel worktrees; return the one the operator picks.
+
+        ``debugger`` must be built on an uncached provider: a repeated traceback
+        would otherwise return the same, already-tried candidates.
+        """
+        cfg = self.config["meridian_aux"]
+        count = int(cfg["speculative_candidates"])
+        self.io.tell(f"Debug: requesting {count} candidate patches...")
+        proposals = debugger.propose_many(
+            Path(__file__).parent / "prompts" / "debugger.md", traceback, count, task_context=context
+        )
+        results = evaluate_candidates(repo, proposals, snippet, workdir, int(cfg.get("speculative_jobs") or 0))
+        report = [{**asdict(r), "passed": r.passed, "patch": f"candidate_{r.index}/patch.diff"} for r in results]
+        workdir.mkdir(parents=True, exist_ok=True)
+        (workdir / "report.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+        passing = rank_passing(results)
+        if not passing:
+            self.io.tell(f"No debug candidate passed ({len(results)} tested); see {workdir.name}/report.json")
+            return None
+        for n, result in enumerate(passing, start=1):
+            note = result.notes.strip().splitlines()[0] if result.notes.strip() else ""
+            self.io.tell(f"[{n}] candidate {result.index}: {self._patch_summary(result.patch)} {note}".rstrip())
+        answer = self.io.ask(f"Apply passing candidate [1-{len(passing)}, blank to skip]: ").strip()
+        if answer.isdigit() and 1 <= int(answer) <= len(passing):
+            return passing[int(answer) - 1]
+        return None
+
     def run(self, task: Task, task_dir: Path) -> None:
         """Execute end-to-end plugin flow up to patch/test artifacts."""
         paths = self.config["paths"]
@@ -36,17 +136,54 @@ class MeridianAuxProject:
         meridian_aux = Path(paths["meridian_aux_repo"])
         repos = {meridian.name: meridian, meridian_aux.name: meridian_aux}
         index_path = Path(self.config["data_swarm_home"]) / "indexes" / "meridian" / "index.sqlite"
-        build_index(index_path, [meridian, meridian_aux])
-
         cfg = self.config["meridian_aux"]
+        build_index(
+            index_path,
+            [meridian, meridian_aux],
+            jobs=int(cfg.get("index_jobs", 0)),
+            batch_size=int(cfg.get("index_batch_size", 5000)),
+            repo_precedence=list(cfg.get("repo_precedence") or []),
+        )
+
         evidence = task_dir / "07_deliverable" / "evidence"
         evidence.mkdir(parents=True, exist_ok=True)
         nav = NavigatorAgent().decide(index_path, task.description)
         (evidence / "00_navigation.json").write_text(json.dumps(nav, indent=2), encoding="utf-8")
 
         entrypoints = [(h["repo"], h["file_path"]) for h in nav.get("entrypoints", [])]
-        selected, edges = dependency_closure(index_path, entrypoints, cfg["max_files"])
-        snippets, used_chars = RetrieverAgent().retrieve(repos, selected, evidence / "snippets", cfg["max_chars"])
+        scores: dict[tuple[str, str], float] = {}
+        if cfg.get("closure_mode", "ranked") == "ranked":
+            seeds = {(h["repo"], h["file_path"]): float(h.get("score") or 1.0) for h in nav.get("entrypoints", [])}
+            selected, edges, scores = ranked_dependency_closure(index_path, seeds, cfg["max_files"])
+        else:
+            selected, edges = dependency_closure(index_path, entrypoints, cfg["max_files"])
+        tiers: dict[tuple[str, str], str] = {}
+        distances = closure_distances(index_path, entrypoints)
+        if cfg.get("evidence_tiers", True):
+            tiers = assign_tiers(distances, selected, int(cfg.get("full_source_max_distance", 1)))
+        estimator = TokenEstimator(self.config["llm"]["model"])
+        max_tokens = int(cfg.get("max_tokens") or 0)
+        snippets, used_chars, sources = RetrieverAgent().retrieve(
+            repos,
+            selected,
+            evidence / "snippets",
+            cfg["max_chars"],
+            index_path=index_path if cfg.get("snippet_mode", "symbols") == "symbols" else None,
+            hits=nav.get("entrypoints", []),
+            values=scores or None,
+            report_path=evidence / "packing_report.md",
+            tiers=tiers or None,
+            max_tokens=max_tokens or None,
+            estimator=estimator,
+            store=BlobStore(Path(self.config["data_swarm_home"])) if cfg.get("evidence_store", True) else None,
+        )
+        tier_used: dict[str, list[int]] = {}
+        for snippet in snippets:
+            tier = tiers.get(sources[snippet], FULL_TIER)
+            used = tier_used.setdefault(tier, [0, 0])
+            used[0] += len(snippet.read_text(encoding="utf-8"))
+            used[1] += estimator.count_file(snippet)
+        used_tokens = sum(t for _, t in tier_used.values())
         (evidence / "context.md").write_text(
             "\n".join(
                 [
@@ -54,21 +191,66 @@ class MeridianAuxProject:
                     "## Selected entrypoints",
                     *[f"- {r}/{p}" for r, p in entrypoints],
                     "## Files included",
-                    *[f"- {r}/{p}" for r, p in selected],
+                    *[self._file_line(f, scores, tiers, distances) for f in selected],
                     "## Import edges followed",
                     *[f"- {e['from']} -> {e['to']} ({e['import']})" for e in edges],
                     "## Budgets used",
                     f"- files: {len(selected)} / {cfg['max_files']}",
                     f"- chars: {used_chars} / {cfg['max_chars']}",
+                    f"- tokens: {used_tokens} / {max_tokens or 'unbounded'} (estimated, {estimator.family})",
+                    *[f"- {tier} tier: {c} chars, {t} tokens" for tier, (c, t) in sorted(tier_used.items())],
+                    f"- snippets packed: {len(snippets)} / {len(selected)} (see packing_report.md)",
                 ]
             ),
             encoding="utf-8",
         )
 
         context = (evidence / "context.md").read_text(encoding="utf-8")
-        generated = CodegenAgent(self.config["llm"]["model"]).generate(
+        logs = LogStore(task_dir)
+        pricing = self.config["llm"].get("pricing") or {}
+        policy = load_stage_policy(Path(self.config["data_swarm_home"]), "meridian_aux")
+
+        def routed(role: str, cached: bool = True) -> RoutedProvider:
+            route = Route.from_config(self.config["llm"], role)
+
+            def instrumented(model: str) -> InstrumentedProvider:
+                def emit(data: dict) -> None:
+                    logs.event(task.task_id, "deliverable", LLM_CALL_EVENT, f"LLM call ({role})", data)
+
+                provider = self._provider(task, task_dir, model, route.timeout_seconds, cached)
+                return InstrumentedProvider(provider, role, emit, pricing)
+
+            def on_route(model: str, reason: str) -> None:
+                data = {"role": role, "model": model, "reason": reason}
+                logs.event(task.task_id, "deliverable", "llm_route", f"LLM route ({role}) -> {model}", data)
+
+            fallback = route.fallback_model if route.fallback_model != route.model else ""
+            primary = instrumented(route.model)
+            return RoutedProvider(route, primary, instrumented(fallback) if fallback else None, on_route)
+
+        shown: dict[str, str] = {}
+
+        def on_section(key: str, value: object) -> None:
+            if key == "patch" and isinstance(value, str) and value:
+                shown["patch"] = value
+                self.io.tell(f"Patch summary: {self._patch_summary(value)}")
+            else:
+                self.io.tell(f"Codegen: {key} received")
+
+        stream = bool(self.config["llm"].get("stream", True))
+        if stream:
+            self.io.tell("Codegen: streaming response...")
+        codegen_provider = routed("codegen")
+        generated = CodegenAgent(
+            codegen_provider.model,
+            max_tokens=int(cfg.get("max_prompt_tokens") or 0) or None,
+            provider=codegen_provider,
+            policy=policy,
+        ).generate(
             Path(__file__).parent / "prompts" / "codegen.md",
             context,
+            evidence=snippets,
+            on_section=on_section if stream else None,
         )
         deliverable = task_dir / "07_deliverable"
         patch = generated.get("patch", "")
@@ -78,9 +260,13 @@ class MeridianAuxProject:
         (deliverable / "notes.md").write_text(generated.get("notes", ""), encoding="utf-8")
 
         iteration = 0
+        # Debug prompts repeat when a patch does not change the failure; a cached answer would repeat the patch.
+        debugger_provider = routed("debugger", cached=False)
+        debugger = DebuggerAgent(debugger_provider.model, provider=debugger_provider, policy=policy)
         snippet_path = deliverable / "snippet.py"
         if patch:
-            self.io.tell(f"Patch summary: {self._patch_summary(patch)}")
+            if shown.get("patch") != patch:
+                self.io.tell(f"Patch summary: {self._patch_summary(patch)}")
             if approve(self.io, "Approve patch apply to meridian_aux repo?"):
                 apply_patch_safe(patch, meridian_aux)
 
@@ -102,9 +288,28 @@ class MeridianAuxProject:
                 break
 
             debug_context = (deliverable / "traceback.txt").read_text(encoding="utf-8")
-            debug = DebuggerAgent(self.config["llm"]["model"]).propose(
+            if int(cfg.get("speculative_candidates") or 0) > 1:
+                chosen = self._speculative_debug(
+                    debugger,
+                    debug_context,
+                    context,
+                    meridian_aux,
+                    snippet_path,
+                    deliverable / f"candidates_{iteration + 1}",
+                )
+                if chosen is None:
+                    break
+                (deliverable / f"debug_notes_{iteration + 1}.md").write_text(chosen.notes, encoding="utf-8")
+                if chosen.probe_snippet:
+                    snippet_path.write_text(chosen.probe_snippet, encoding="utf-8")
+                apply_patch_safe(chosen.patch, meridian_aux)
+                (deliverable / f"debug_patch_{iteration + 1}.diff").write_text(chosen.patch, encoding="utf-8")
+                iteration += 1
+                continue
+            debug = debugger.propose(
                 Path(__file__).parent / "prompts" / "debugger.md",
                 debug_context,
+                task_context=context,
             )
             (deliverable / f"debug_notes_{iteration + 1}.md").write_text(debug.get("notes", ""), encoding="utf-8")
             if debug.get("probe_snippet"):
@@ -0,0 +1,255 @@
+"""Compact in-memory import graph loaded from the index ``edges`` table."""
+
+from __future__ import annotations
+
+import sqlite3
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from contextlib import closing
+from pathlib import Path
+
+RepoFile = tuple[str, str]
+
+_CACHE: dict[str, tuple[str, ImportGraph]] = {}
+
+
+def _csr(count: int, pairs: list[tuple[int, int]]) -> tuple[array, array, array]:
+    """Stable counting sort of ``(src, dst)`` pairs into CSR offsets/targets plus edge positions."""
+    offsets = array("l", [0]) * (count + 1)
+    for src, _ in pairs:
+        offsets[src + 1] += 1
+    for i in range(count):
+        offsets[i + 1] += offsets[i]
+    cursor = array("l", offsets[:-1])
+    targets = array("l", [0]) * len(pairs)
+    positions = array("l", [0]) * len(pairs)
+    for edge_id, (src, dst) in enumerate(pairs):
+        slot = cursor[src]
+        targets[slot] = dst
+        positions[slot] = edge_id
+        cursor[src] += 1
+    return offsets, targets, positions
+
+
+class ImportGraph:
+    """Forward and reverse CSR adjacency over integer file ids.
+
+    ``files[i]`` is the ``(repo, path)`` for id ``i``; successors of ``i`` are
+    ``targets[offsets[i]:offsets[i + 1]]`` in edge-discovery order.
+    """
+
+    def __init__(self, files: list[RepoFile], edges: Iterable[tuple[RepoFile, RepoFile, str]]) -> None:
+        self.files = list(files)
+        self.ids = {f: i for i, f in enumerate(self.files)}
+        labels: dict[str, int] = {}
+        pairs: list[tuple[int, int]] = []
+        edge_labels = array("l")
+        for src, dst, imported in edges:
+            pairs.append((self._id(src), self._id(dst)))
+            edge_labels.append(labels.setdefault(imported, len(labels)))
+        self.labels = list(labels)
+        n = len(self.files)
+        self.offsets, self.targets, order = _csr(n, pairs)
+        self.edge_labels = array("l", (edge_labels[i] for i in order))
+        self.rev_offsets, self.rev_targets, _ = _csr(n, [(dst, src) for src, dst in pairs])
+
+    def _id(self, item: RepoFile) -> int:
+        if item not in self.ids:
+            self.ids[item] = len(self.files)
+            self.files.append(item)
+        return self.ids[item]
+
+    def successors(self, node: int) -> array:
+        """Return ids imported by ``node``."""
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    def predecessors(self, node: int) -> array:
+        """Return ids that import ``node``."""
+        return self.rev_targets[self.rev_offsets[node] : self.rev_offsets[node + 1]]
+
+    def closure(self, initial: list[RepoFile], max_files: int) -> tuple[list[RepoFile], list[dict[str, str]]]:
+        """Breadth-first closure bounded by ``max_files``, with the edges followed."""
+        seen: set[int] = set()
+        ordered: list[RepoFile] = []
+        edges: list[dict[str, str]] = []
+        queue: deque[RepoFile] = deque(initial)
+        while queue and len(ordered) < max_files:
+            item = queue.popleft()
+            node = self.ids.get(item)
+            if node is None:
+                if item not in ordered:
+                    ordered.append(item)
+                continue
+            if node in seen:
+                continue
+            seen.add(node)
+            ordered.append(item)
+            for slot in range(self.offsets[node], self.offsets[node + 1]):
+                dst = self.targets[slot]
+                resolved = self.files[dst]
+                edges.append(
+                    {
+                        "from": f"{item[0]}/{item[1]}",
+                        "to": f"{resolved[0]}/{resolved[1]}",
+                        "import": self.labels[self.edge_labels[slot]],
+                    }
+                )
+                if dst not in seen and len(ordered) + len(queue) < max_files:
+                    queue.append(resolved)
+        return ordered, edges
+
+    def reachable(self, start: Iterable[int]) -> list[int]:
+        """Return ids reachable from ``start`` along import edges, in breadth-first order."""
+        order = list(dict.fromkeys(start))
+        seen = set(order)
+        i = 0
+        while i < len(order):
+            for dst in self.successors(order[i]):
+                if dst not in seen:
+                    seen.add(dst)
+                    order.append(dst)
+            i += 1
+        return order
+
+    def distances(self, initial: list[RepoFile]) -> dict[RepoFile, int]:
+        """Return import-hop distance from the nearest of ``initial`` for every reachable file."""
+        dist = {f: 0 for f in initial}
+        queue = deque(self.ids[f] for f in initial if f in self.ids)
+        while queue:
+            node = queue.popleft()
+            step = dist[self.files[node]] + 1
+            for dst in self.successors(node):
+                if self.files[dst] not in dist:
+                    dist[self.files[dst]] = step
+                    queue.append(dst)
+        return dist
+
+    def personalized_pagerank(
+        self,
+        seeds: dict[int, float],
+        alpha: float = 0.85,
+        iterations: int = 50,
+        tol: float = 1e-8,
+    ) -> dict[int, float]:
+        """Score nodes reachable from ``seeds`` by PageRank that restarts at the seeds.
+
+        Seed weights form the restart distribution; dangling mass returns to the
+        seeds so scores stay a probability distribution over the reachable set.
+        """
+        total = sum(w for w in seeds.values() if w > 0)
+        restart = {n: w / total for n, w in seeds.items() if w > 0} if total else {n: 1 / len(seeds) for n in seeds}
+        nodes = self.reachable(restart)
+        succ = {n: list(dict.fromkeys(self.successors(n))) for n in nodes}
+        rank = dict(restart)
+        for _ in range(iterations):
+            nxt = dict.fromkeys(nodes, 0.0)
+            dangling = 0.0
+            for node in nodes:
+                mass = rank.get(node, 0.0)
+                if not mass:
+                    continue
+                if not succ[node]:
+                    dangling += mass
+                    continue
+                share = alpha * mass / len(succ[node])
+                for dst in succ[node]:
+                    nxt[dst] += share
+            for node, weight in restart.items():
+                nxt[node] += ((1 - alpha) + alpha * dangling) * weight
+            delta = sum(abs(nxt[n] - rank.get(n, 0.0)) for n in nodes)
+            rank = nxt
+            if delta < tol:
+                break
+        return rank
+
+    def ranked_closure(
+        self,
+        seeds: dict[RepoFile, float],
+        max_files: int,
+        alpha: float = 0.85,
+    ) -> tuple[list[RepoFile], list[dict[str, str]], dict[RepoFile, float]]:
+        """Pick the ``max_files`` highest personalized-PageRank files around ``seeds``.
+
+        Returns the selected files (best first), the import edges among them and
+        each selected file's score. Seeds missing from the index keep their
+        normalized seed weight as score.
+        """
+        known = {self.ids[f]: w for f, w in seeds.items() if f in self.ids}
+        scores: dict[RepoFile, float] = {}
+        order: dict[RepoFile, int] = {}
+        if known:
+            rank = self.personalized_pagerank(known, alpha=alpha)
+            for pos, node in enumerate(self.reachable(known)):
+                scores[self.files[node]] = rank.get(node, 0.0)
+                order[self.files[node]] = pos
+        total = sum(seeds.values()) or 1.0
+        for f, w in seeds.items():
+            if f not in scores:
+                scores[f] = w / total
+                order[f] = len(order)
+        selected = sorted(scores, key=lambda f: (-scores[f], order[f]))[:max_files]
+        chosen = {self.ids[f] for f in selected if f in self.ids}
+        edges: list[dict[str, str]] = []
+        for item in selected:
+            node = self.ids.get(item)
+            if node is None:
+                continue
+            for slot in range(self.offsets[node], self.offsets[node + 1]):
+                dst = self.targets[slot]
+                if dst in chosen:
+                    resolved = self.files[dst]
+                    edges.append(
+                        {
+                            "from": f"{item[0]}/{item[1]}",
+                            "to": f"{resolved[0]}/{resolved[1]}",
+                            "import": self.labels[self.edge_labels[slot]],
+                        }
+                    )
+        return selected, edges, {f: scores[f] for f in selected}
+
+    def dependents(self, files: list[RepoFile], max_files: int | None = None) -> list[RepoFile]:
+        """Return files that transitively import any of ``files`` (nearest first)."""
+        start = [self.ids[f] for f in files if f in self.ids]
+        seen = set(start)
+        out: list[RepoFile] = []
+        queue = deque(start)
+        while queue and (max_files is None or len(out) < max_files):
+            for src in self.predecessors(queue.popleft()):
+                if src in seen:
+                    continue
+                seen.add(src)
+                out.append(self.files[src])
+                queue.append(src)
+                if max_files is not None and len(out) >= max_files:
+                    break
+        return out
+
+
+def index_version(conn: sqlite3.Connection) -> str:
+    """Return the build id stamped whenever the index edges change."""
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'index_version'").fetchone()
+    except sqlite3.OperationalError:
+        return ""
+    return row[0] if row else ""
+
+
+def load_graph(index_path: Path) -> ImportGraph:
+    """Load the import graph for ``index_path``, reusing the cached copy for the same index version."""
+    key = str(Path(index_path).resolve())
+    with closing(sqlite3.connect(index_path)) as conn:
+        version = index_version(conn)
+        cached = _CACHE.get(key)
+        if cached and version and cached[0] == version:
+            return cached[1]
+        files = [(r[0], r[1]) for r in conn.execute("SELECT repo, file_path FROM files ORDER BY rowid")]
+        graph = ImportGraph(
+            files,
+            (
+                ((r[0], r[1]), (r[2], r[3]), r[4])
+                for r in conn.execute("SELECT src_repo, src_file, dst_repo, dst_file, import FROM edges ORDER BY rowid")
+            ),
+        )
+    _CACHE[key] = (version, graph)
+    return graph
@@ -0,0 +1,95 @@
+"""Resolve indexed import statements to concrete files at build time."""
+
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterable
+
+RepoFile = tuple[str, str]
+
+
+def absolute_module(importer: str, imported: str) -> str:
+    """Return the absolute dotted module for ``imported`` as seen from file ``importer``."""
+    if not imported.startswith("."):
+        return imported
+    importer_module = importer.replace("/", ".").removesuffix(".py")
+    base_parts = importer_module.split(".")[:-1]
+    level = len(imported) - len(imported.lstrip("."))
+    suffix = imported.lstrip(".")
+    base = base_parts[: max(0, len(base_parts) - level + 1)]
+    return ".".join([*base, suffix] if suffix else base)
+
+
+class ModuleMap:
+    """Per-repo lookup of dotted module names to files."""
+
+    def __init__(self, modules: Iterable[tuple[str, str, str]]) -> None:
+        by_repo: dict[str, list[tuple[str, str]]] = {}
+        for repo, module_name, file_path in modules:
+            by_repo.setdefault(repo, []).append((module_name, file_path))
+        self._sorted = {repo: sorted(rows) for repo, rows in by_repo.items()}
+        self._names = {repo: [name for name, _ in rows] for repo, rows in self._sorted.items()}
+
+    def repos(self) -> list[str]:
+        """Return repo names present in the map."""
+        return list(self._sorted)
+
+    def exact(self, repo: str, module: str) -> list[RepoFile]:
+        """Return the file(s) defining exactly ``module`` in ``repo``."""
+        names = self._names.get(repo, [])
+        lo = bisect.bisect_left(names, module)
+        hi = bisect.bisect_right(names, module, lo)
+        return [(repo, file_path) for _, file_path in self._sorted[repo][lo:hi]] if hi > lo else []
+
+    def resolve(self, repo: str, module: str, name: str = "") -> list[RepoFile]:
+        """Resolve ``import module`` or ``from module import name`` inside ``repo``.
+
+        A from-import resolves to the submodule when ``name`` is one, otherwise
+        to the package's ``__init__`` (or the module file) only.
+        """
+        if name and name != "*":
+            hits = self.exact(repo, f"{module}.{name}" if module else name)
+            if hits:
+                return hits
+        return self.exact(repo, module)
+
+
+def repo_search_order(importer_repo: str, imported: str, repos: list[str], precedence: list[str] | None) -> list[str]:
+    """Return the repos to try, in order, when resolving ``imported`` from ``importer_repo``.
+
+    Relative imports only resolve inside the importer's repo. Absolute imports
+    follow ``precedence`` when configured, otherwise the importer's own repo
+    first and then the remaining repos in index order.
+    """
+    if imported.startswith("."):
+        return [importer_repo]
+    head = list(precedence) if precedence else [importer_repo]
+    return [*head, *(r for r in [importer_repo, *repos] if r not in head)]
+
+
+def resolve_edges(
+    modules: Iterable[tuple[str, str, str]],
+    imports: Iterable[tuple[str, str, str, str]],
+    repos: list[str] | None = None,
+    precedence: list[str] | None = None,
+) -> list[tuple[str, str, str, str, str]]:
+    """Resolve ``(repo, file_path, imported_module, imported_name)`` rows into edge rows across every indexed repo.
+
+    Each import resolves into the first repo in :func:`repo_search_order` that
+    defines it. Edge rows are ``(src_repo, src_file, dst_repo, dst_file, import)``
+    and are de-duplicated, so ``from pkg import a, b`` yields one edge to ``pkg``.
+    """
+    module_map = ModuleMap(modules)
+    repos = list(repos or module_map.repos())
+    edges: dict[tuple[str, str, str, str, str], None] = {}
+    for repo, file_path, imported, name in imports:
+        if not imported and not name:
+            continue
+        module = absolute_module(file_path, imported)
+        for candidate in repo_search_order(repo, imported, repos, precedence):
+            hits = module_map.resolve(candidate, module, name)
+            if hits:
+                for dst_repo, dst_file in hits:
+                    edges[(repo, file_path, dst_repo, dst_file, imported)] = None
+                break
+    return list(edges)
@@ -0,0 +1,167 @@
+"""Batched single-transaction SQLite writer for the Meridian index."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from collections.abc import Sequence
+from types import TracebackType
+
+RepoFile = tuple[str, str]
+
+BUILD_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA temp_store = MEMORY",
+)
+RESTORED_PRAGMAS = ("journal_mode", "synchronous")
+
+SECONDARY_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_symbols_file ON symbols(repo, file_path)",
+    "CREATE INDEX IF NOT EXISTS idx_modules_file ON modules(repo, file_path)",
+    "CREATE INDEX IF NOT EXISTS idx_imports_file ON imports(repo, file_path)",
+    "CREATE INDEX IF NOT EXISTS idx_edges_src ON edges(src_repo, src_file)",
+    "CREATE INDEX IF NOT EXISTS idx_edges_dst ON edges(dst_repo, dst_file)",
+)
+
+FILE_TABLES = ("symbols", "modules", "imports")
+
+
+class IndexWriter:
+    """Buffer index rows and flush them with ``executemany`` inside one transaction.
+
+    Use as a context manager: build pragmas are applied and a transaction is
+    opened on enter; on a clean exit buffers are flushed, the ``deferred``
+    statements (secondary indexes by default) run and the transaction is
+    committed. The connection's journal mode and synchronous level are
+    restored on exit. Time spent writing is tracked in ``insert_seconds``
+    and index creation plus commit in ``index_seconds``.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        batch_size: int = 5000,
+        deferred: Sequence[str] = SECONDARY_INDEXES,
+    ) -> None:
+        self.conn = conn
+        self.batch_size = max(1, batch_size)
+        self.deferred = deferred
+        self.insert_seconds = 0.0
+        self.index_seconds = 0.0
+        self._deletes: list[RepoFile] = []
+        self._modules: list[tuple] = []
+        self._symbols: list[tuple] = []
+        self._imports: list[tuple] = []
+        self._files: list[tuple] = []
+        self._touches: list[tuple] = []
+        self._forgets: list[RepoFile] = []
+
+    def __enter__(self) -> IndexWriter:
+        self._isolation = self.conn.isolation_level
+        self.conn.isolation_level = None
+        self._restore = {name: self.conn.execute(f"PRAGMA {name}").fetchone()[0] for name in RESTORED_PRAGMAS}
+        for pragma in BUILD_PRAGMAS:
+            self.conn.execute(pragma)
+        self.conn.execute("BEGIN")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        try:
+            if exc_type is not None:
+                self.conn.execute("ROLLBACK")
+                return
+            self.flush()
+            started = time.perf_counter()
+            for statement in self.deferred:
+                self.conn.execute(statement)
+            self.conn.execute("COMMIT")
+            self.index_seconds += time.perf_counter() - started
+        finally:
+            for name, value in self._restore.items():
+                self.conn.execute(f"PRAGMA {name} = {value}")
+            self.conn.isolation_level = self._isolation
+
+    def delete_file(self, repo: str, file_path: str, forget: bool = False) -> None:
+        """Queue deletion of every row for a file; ``forget`` also drops its ``files`` row."""
+        self._deletes.append((repo, file_path))
+        if forget:
+            self._forgets.append((repo, file_path))
+        self._maybe_flush()
+
+    def add_file(
+        self,
+        file_row: tuple,
+        module_row: tuple,
+        symbol_rows: list[tuple],
+        import_rows: list[tuple],
+    ) -> None:
+        """Queue the parsed rows for one file."""
+        self._files.append(file_row)
+        self._modules.append(module_row)
+        self._symbols.extend(symbol_rows)
+        self._imports.extend(import_rows)
+        self._maybe_flush()
+
+    def touch_file(self, repo: str, file_path: str, size: int, mtime_ns: int) -> None:
+        """Queue a size/mtime refresh for a file whose content hash is unchanged."""
+        self._touches.append((size, mtime_ns, repo, file_path))
+        self._maybe_flush()
+
+    def _pending(self) -> int:
+        return (
+            len(self._deletes)
+            + len(self._modules)
+            + len(self._symbols)
+            + len(self._imports)
+            + len(self._files)
+            + len(self._touches)
+            + len(self._forgets)
+        )
+
+    def _maybe_flush(self) -> None:
+        if self._pending() >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered rows; deletes are applied before inserts."""
+        started = time.perf_counter()
+        if self._deletes:
+            for table in FILE_TABLES:
+                self.conn.executemany(f"DELETE FROM {table} WHERE repo = ? AND file_path = ?", self._deletes)
+        if self._forgets:
+            self.conn.executemany("DELETE FROM files WHERE repo = ? AND file_path = ?", self._forgets)
+        if self._touches:
+            self.conn.executemany(
+                "UPDATE files SET size = ?, mtime_ns = ? WHERE repo = ? AND file_path = ?",
+                self._touches,
+            )
+        if self._modules:
+            self.conn.executemany("INSERT INTO modules VALUES (?, ?, ?)", self._modules)
+        if self._symbols:
+            self.conn.executemany(
+                "INSERT INTO symbols(repo, file_path, symbol, symbol_parts, kind, lineno, end_lineno, docstring) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                self._symbols,
+            )
+        if self._imports:
+            self.conn.executemany("INSERT INTO imports VALUES (?, ?, ?, ?)", self._imports)
+        if self._files:
+            self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", self._files)
+        for buffer in (
+            self._deletes,
+            self._modules,
+            self._symbols,
+            self._imports,
+            self._files,
+            self._touches,
+            self._forgets,
+        ):
+            buffer.clear()
+        self.insert_seconds += time.perf_counter() - started
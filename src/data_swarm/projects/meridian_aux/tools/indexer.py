@@ -3,9 +3,89 @@
 from __future__ import annotations
 
 import ast
+import hashlib
+import json
+import logging
+import os
+import re
 import sqlite3
+import time
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from functools import lru_cache
 from pathlib import Path
 
+from data_swarm.projects.meridian_aux.tools.import_resolver import resolve_edges
+from data_swarm.projects.meridian_aux.tools.index_writer import SECONDARY_INDEXES, IndexWriter
+
+logger = logging.getLogger(__name__)
+
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z0-9])|[A-Z]?[a-z0-9]+|[A-Z]+")
+
+SCHEMA_VERSION = 5
+PARALLEL_MIN_FILES = 64
+FTS_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    repo TEXT,
+    file_path TEXT,
+    size INTEGER,
+    mtime_ns INTEGER,
+    sha256 TEXT,
+    PRIMARY KEY (repo, file_path)
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    id INTEGER PRIMARY KEY,
+    repo TEXT,
+    file_path TEXT,
+    symbol TEXT,
+    symbol_parts TEXT,
+    kind TEXT,
+    lineno INTEGER,
+    end_lineno INTEGER,
+    docstring TEXT
+);
+CREATE TABLE IF NOT EXISTS modules (
+    repo TEXT,
+    module_name TEXT,
+    file_path TEXT
+);
+CREATE TABLE IF NOT EXISTS imports (
+    repo TEXT,
+    file_path TEXT,
+    imported_module TEXT,
+    imported_name TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS edges (
+    src_repo TEXT,
+    src_file TEXT,
+    dst_repo TEXT,
+    dst_file TEXT,
+    import TEXT
+);
+"""
+
+# Full-text index over symbols, created after the bulk load of a fresh build and
+# kept in sync by triggers during incremental builds.
+FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS symbols_fts USING fts5("
+    "symbol, symbol_parts, file_path, docstring, content='symbols', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS symbols_fts_insert AFTER INSERT ON symbols BEGIN "
+    "INSERT INTO symbols_fts(rowid, symbol, symbol_parts, file_path, docstring) "
+    "VALUES (new.id, new.symbol, new.symbol_parts, new.file_path, new.docstring); END",
+    "CREATE TRIGGER IF NOT EXISTS symbols_fts_delete AFTER DELETE ON symbols BEGIN "
+    "INSERT INTO symbols_fts(symbols_fts, rowid, symbol, symbol_parts, file_path, docstring) "
+    "VALUES ('delete', old.id, old.symbol, old.symbol_parts, old.file_path, old.docstring); END",
+    "INSERT INTO symbols_fts(symbols_fts) VALUES ('rebuild')",
+)
+
 
 def _iter_py_files(root: Path) -> list[Path]:
     return [p for p in root.rglob("*.py") if ".git" not in p.parts]
@@ -18,74 +98,259 @@ def _module_name_from_path(path: Path) -> str:
     return ".".join(parts)
 
 
-def build_index(index_path: Path, repos: list[Path]) -> None:
-    """Build sqlite AST index for provided repos."""
+def split_identifier(name: str) -> list[str]:
+    """Split snake_case, CamelCase and dotted identifiers into lowercase parts."""
+    parts: list[str] = []
+    for chunk in re.split(r"[^0-9A-Za-z]+", name):
+        parts.extend(p.lower() for p in _CAMEL_RE.findall(chunk))
+    return parts
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _reset_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        DROP TABLE IF EXISTS files;
+        DROP TABLE IF EXISTS symbols_fts;
+        DROP TABLE IF EXISTS symbols;
+        DROP TABLE IF EXISTS modules;
+        DROP TABLE IF EXISTS imports;
+        DROP TABLE IF EXISTS edges;
+        """
+    )
+
+
+def _extract_rows(repo: str, rel_text: str, source: str) -> tuple[tuple, list[tuple], list[tuple]]:
+    """Parse one file into compact module, symbol and import row tuples."""
+    module_row = (repo, _module_name_from_path(Path(rel_text)), rel_text)
+    symbol_rows: list[tuple] = []
+    import_rows: list[tuple] = []
+    tree = ast.parse(source)
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            symbol_rows.append(
+                (
+                    repo,
+                    rel_text,
+                    node.name,
+                    " ".join(split_identifier(node.name)),
+                    type(node).__name__,
+                    getattr(node, "lineno", 1),
+                    getattr(node, "end_lineno", None) or getattr(node, "lineno", 1),
+                    ast.get_docstring(node) or "",
+                )
+            )
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                import_rows.append((repo, rel_text, alias.name, ""))
+        if isinstance(node, ast.ImportFrom):
+            mod = node.module or ""
+            if node.level:
+                mod = "." * node.level + mod
+            for alias in node.names:
+                import_rows.append((repo, rel_text, mod, alias.name))
+    return module_row, symbol_rows, import_rows
+
+
+def _parse_job(job: tuple[str, str, str, str | None]) -> tuple[str, str, str, tuple | None]:
+    """Hash and parse one file; runs inside pool workers.
+
+    Rows are ``None`` when the content hash matches ``previous_sha``.
+    """
+    repo, root, rel_text, previous_sha = job
+    data = (Path(root) / rel_text).read_bytes()
+    digest = _sha256(data)
+    if digest == previous_sha:
+        return repo, rel_text, digest, None
+    return repo, rel_text, digest, _extract_rows(repo, rel_text, data.decode("utf-8"))
+
+
+def _resolve_jobs(jobs: int) -> int:
+    return jobs if jobs > 0 else os.cpu_count() or 1
+
+
+def _run_jobs(pending: list[tuple[str, str, str, str | None]], jobs: int) -> Iterator[tuple]:
+    workers = min(_resolve_jobs(jobs), len(pending))
+    if workers <= 1 or len(pending) < PARALLEL_MIN_FILES:
+        yield from map(_parse_job, pending)
+        return
+    chunksize = max(1, len(pending) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_parse_job, pending, chunksize=chunksize)
+
+
+def _meta(conn: sqlite3.Connection, key: str) -> str | None:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _rebuild_edges(conn: sqlite3.Connection, repos: list[str], precedence: list[str] | None, signature: str) -> None:
+    """Re-resolve every import into the ``edges`` table.
+
+    Resolution of unchanged importers can change when modules are added or
+    removed, so edges are recomputed in full whenever the file set or the
+    resolution settings changed.
+    """
+    edges = resolve_edges(
+        conn.execute("SELECT repo, module_name, file_path FROM modules"),
+        conn.execute("SELECT repo, file_path, imported_module, imported_name FROM imports ORDER BY rowid").fetchall(),
+        repos=repos,
+        precedence=precedence,
+    )
+    conn.execute("DELETE FROM edges")
+    conn.executemany("INSERT INTO edges VALUES (?, ?, ?, ?, ?)", edges)
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('resolution', ?)", (signature,))
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('index_version', ?)", (uuid.uuid4().hex,))
+
+
+def build_index(
+    index_path: Path,
+    repos: list[Path],
+    full: bool = False,
+    jobs: int = 1,
+    batch_size: int = 5000,
+    repo_precedence: list[str] | None = None,
+) -> dict[str, int]:
+    """Build or incrementally refresh the sqlite AST index for provided repos.
+
+    Files are tracked by size, mtime and sha256 in the ``files`` table. Unless
+    ``full`` is set, only added or changed files are re-parsed and rows for
+    removed files are deleted. Parsing fans out to ``jobs`` worker processes
+    (``0`` uses every core) while this process stays the single SQLite writer,
+    batching ``batch_size`` rows per ``executemany`` in one transaction.
+    Imports resolve across all ``repos``; ``repo_precedence`` (repo names)
+    decides which repo wins when several define the same module. Returns
+    counts of added/changed/removed/unchanged files.
+    """
     index_path.parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(index_path) as conn:
-        conn.executescript(
-            """
-            DROP TABLE IF EXISTS symbols;
-            DROP TABLE IF EXISTS modules;
-            DROP TABLE IF EXISTS imports;
-            CREATE TABLE symbols (
-                repo TEXT,
-                file_path TEXT,
-                symbol TEXT,
-                kind TEXT,
-                lineno INTEGER,
-                docstring TEXT
-            );
-            CREATE TABLE modules (
-                repo TEXT,
-                module_name TEXT,
-                file_path TEXT
-            );
-            CREATE TABLE imports (
-                repo TEXT,
-                file_path TEXT,
-                imported_module TEXT
-            );
-            """
-        )
+    stats = {"added": 0, "changed": 0, "removed": 0, "unchanged": 0}
+    timings = {"discover": 0.0, "parse": 0.0, "insert": 0.0, "resolve": 0.0, "index": 0.0}
+    with closing(sqlite3.connect(index_path)) as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        fresh = full or version != SCHEMA_VERSION
+        if fresh:
+            _reset_schema(conn)
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        started = time.perf_counter()
+        known = {
+            (r[0], r[1]): (r[2], r[3], r[4])
+            for r in conn.execute("SELECT repo, file_path, size, mtime_ns, sha256 FROM files")
+        }
+        seen: set[tuple[str, str]] = set()
+        stat_by_key: dict[tuple[str, str], tuple[int, int]] = {}
+        pending: list[tuple[str, str, str, str | None]] = []
         for repo in repos:
             for path in _iter_py_files(repo):
-                rel = path.relative_to(repo)
-                rel_text = str(rel)
-                module = _module_name_from_path(rel)
-                conn.execute("INSERT INTO modules VALUES (?, ?, ?)", (repo.name, module, rel_text))
-                tree = ast.parse(path.read_text(encoding="utf-8"))
-                for node in ast.walk(tree):
-                    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-                        conn.execute(
-                            "INSERT INTO symbols VALUES (?, ?, ?, ?, ?, ?)",
-                            (
-                                repo.name,
-                                rel_text,
-                                node.name,
-                                type(node).__name__,
-                                getattr(node, "lineno", 1),
-                                ast.get_docstring(node) or "",
-                            ),
-                        )
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            conn.execute("INSERT INTO imports VALUES (?, ?, ?)", (repo.name, rel_text, alias.name))
-                    if isinstance(node, ast.ImportFrom):
-                        mod = node.module or ""
-                        if node.level:
-                            mod = "." * node.level + mod
-                        conn.execute("INSERT INTO imports VALUES (?, ?, ?)", (repo.name, rel_text, mod))
+                key = (repo.name, str(path.relative_to(repo)))
+                seen.add(key)
+                st = path.stat()
+                previous = known.get(key)
+                if previous and previous[0] == st.st_size and previous[1] == st.st_mtime_ns:
+                    stats["unchanged"] += 1
+                    continue
+                stat_by_key[key] = (st.st_size, st.st_mtime_ns)
+                pending.append((repo.name, str(repo), key[1], previous[2] if previous else None))
+        timings["discover"] = time.perf_counter() - started
+
+        deferred = SECONDARY_INDEXES + (FTS_SCHEMA if fresh and fts5_available() else ())
+        with IndexWriter(conn, batch_size=batch_size, deferred=deferred) as writer:
+            started = time.perf_counter()
+            for repo_name, rel_text, digest, rows in _run_jobs(pending, jobs):
+                key = (repo_name, rel_text)
+                size, mtime_ns = stat_by_key[key]
+                if rows is None:
+                    writer.touch_file(*key, size, mtime_ns)
+                    stats["unchanged"] += 1
+                    continue
+                if key in known:
+                    writer.delete_file(*key)
+                    stats["changed"] += 1
+                else:
+                    stats["added"] += 1
+                module_row, symbol_rows, import_rows = rows
+                writer.add_file((*key, size, mtime_ns, digest), module_row, symbol_rows, import_rows)
+            for key in set(known) - seen:
+                writer.delete_file(*key, forget=True)
+                stats["removed"] += 1
+            timings["parse"] = time.perf_counter() - started - writer.insert_seconds
+            repo_names = [r.name for r in repos]
+            signature = json.dumps({"repos": repo_names, "precedence": repo_precedence or []})
+            changed = stats["added"] or stats["changed"] or stats["removed"]
+            if fresh or changed or _meta(conn, "resolution") != signature:
+                writer.flush()
+                started = time.perf_counter()
+                _rebuild_edges(conn, repo_names, repo_precedence or None, signature)
+                timings["resolve"] = time.perf_counter() - started
+        timings["insert"] = writer.insert_seconds
+        timings["index"] = writer.index_seconds
+
+    logger.info(
+        "index build %s: %s; %s",
+        "full" if full else "incremental",
+        " ".join(f"{k}={v}" for k, v in stats.items()),
+        " ".join(f"{phase}={seconds:.3f}s" for phase, seconds in timings.items()),
+    )
+    return stats
+
+
+@lru_cache(maxsize=1)
+def fts5_available() -> bool:
+    """Return True when the linked SQLite library ships the FTS5 extension."""
+    with closing(sqlite3.connect(":memory:")) as conn:
+        try:
+            conn.execute("CREATE VIRTUAL TABLE probe USING fts5(x)")
+        except sqlite3.OperationalError:
+            return False
+    return True
+
+
+def has_fts(conn: sqlite3.Connection) -> bool:
+    """Return True when the index has a ``symbols_fts`` table."""
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'symbols_fts'").fetchone()
+    return row is not None
+
+
+def fts_query(query: str) -> str:
+    """Build an FTS5 MATCH expression: OR of quoted prefix terms from split identifiers."""
+    terms: list[str] = []
+    for word in re.findall(r"[0-9A-Za-z_]+", query):
+        for part in split_identifier(word):
+            if part not in terms:
+                terms.append(part)
+    return " OR ".join(f'"{t}"*' for t in terms)
+
+
+def _row_to_hit(row: tuple) -> dict[str, str]:
+    return {"repo": row[0], "file_path": row[1], "symbol": row[2], "kind": row[3], "lineno": str(row[4])}
 
 
 def search_index(index_path: Path, query: str, limit: int = 10) -> list[dict[str, str]]:
-    """Search indexed symbols by substring."""
-    with sqlite3.connect(index_path) as conn:
+    """Search indexed symbols, best BM25 match first.
+
+    Uses the ``symbols_fts`` table with column weights (symbol > split parts >
+    path > docstring); falls back to substring matching for indexes built
+    without FTS5.
+    """
+    match = fts_query(query)
+    if not match:
+        return []
+    with closing(sqlite3.connect(index_path)) as conn:
+        if not has_fts(conn):
+            rows = conn.execute(
+                "SELECT repo, file_path, symbol, kind, lineno FROM symbols "
+                "WHERE symbol LIKE ? OR file_path LIKE ? OR docstring LIKE ? LIMIT ?",
+                (f"%{query}%", f"%{query}%", f"%{query}%", limit),
+            ).fetchall()
+            return [_row_to_hit(r) for r in rows]
         rows = conn.execute(
-            "SELECT repo, file_path, symbol, kind, lineno FROM symbols "
-            "WHERE symbol LIKE ? OR file_path LIKE ? OR docstring LIKE ? LIMIT ?",
-            (f"%{query}%", f"%{query}%", f"%{query}%", limit),
+            "SELECT s.repo, s.file_path, s.symbol, s.kind, s.lineno FROM symbols_fts "
+            "JOIN symbols AS s ON s.id = symbols_fts.rowid "
+            "WHERE symbols_fts MATCH ? ORDER BY bm25(symbols_fts, ?, ?, ?, ?) LIMIT ?",
+            (match, *FTS_WEIGHTS, limit),
         ).fetchall()
-    return [
-        {"repo": r[0], "file_path": r[1], "symbol": r[2], "kind": r[3], "lineno": str(r[4])}
-        for r in rows
-    ]
+    return [_row_to_hit(r) for r in rows]
@@ -0,0 +1,106 @@
+"""Budget-aware selection of evidence items (0/1 knapsack)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+RepoFile = tuple[str, str]
+
+EXACT_MAX_ITEMS = 20
+
+
+@dataclass
+class PackItem:
+    """Candidate evidence item with a relevance value and a size in budget units."""
+
+    key: RepoFile
+    value: float
+    size: int
+
+
+@dataclass
+class PackDecision:
+    """Outcome for one item, with a human-readable reason."""
+
+    key: RepoFile
+    value: float
+    size: int
+    included: bool
+    reason: str
+
+
+def _density(item: PackItem) -> float:
+    return item.value / max(item.size, 1)
+
+
+def _greedy(items: list[PackItem], budget: int) -> set[int]:
+    chosen: set[int] = set()
+    left = budget
+    for i in sorted(range(len(items)), key=lambda i: _density(items[i]), reverse=True):
+        if items[i].size <= left:
+            chosen.add(i)
+            left -= items[i].size
+    return chosen
+
+
+def _exact(items: list[PackItem], budget: int) -> set[int]:
+    """Exact knapsack over a Pareto frontier of (size, value) states; fine for small N."""
+    frontier: list[tuple[int, float, int]] = [(0, 0.0, 0)]
+    for i, item in enumerate(items):
+        extended = [(s + item.size, v + item.value, m | (1 << i)) for s, v, m in frontier if s + item.size <= budget]
+        merged = sorted(frontier + extended, key=lambda st: (st[0], -st[1]))
+        frontier = []
+        for state in merged:
+            if not frontier or state[1] > frontier[-1][1]:
+                frontier.append(state)
+    best = max(frontier, key=lambda st: st[1])
+    return {i for i in range(len(items)) if best[2] >> i & 1}
+
+
+def pack(items: list[PackItem], budget: int, exact_max_items: int = EXACT_MAX_ITEMS) -> list[PackDecision]:
+    """Choose items maximizing total value within ``budget``.
+
+    Greedy by value density; when there are at most ``exact_max_items`` items an
+    exact pass runs and wins if it finds a better set. Decisions keep input order.
+    """
+    chosen = _greedy(items, budget)
+    method = "greedy"
+    if len(items) <= exact_max_items:
+        exact = _exact(items, budget)
+        if sum(items[i].value for i in exact) > sum(items[i].value for i in chosen) + 1e-12:
+            chosen, method = exact, "exact"
+    used = sum(items[i].size for i in chosen)
+    floor = min((_density(items[i]) for i in chosen), default=0.0)
+    decisions: list[PackDecision] = []
+    for i, item in enumerate(items):
+        density = _density(item)
+        if i in chosen:
+            reason = f"included ({method}, value/size {density:.3g})"
+        elif item.size > budget:
+            reason = f"excluded: size {item.size} exceeds whole budget {budget}"
+        elif item.size > budget - used:
+            reason = f"excluded: size {item.size} > {budget - used} remaining after higher-density items"
+        else:
+            reason = f"excluded: value/size {density:.3g} below included floor {floor:.3g}"
+        decisions.append(PackDecision(item.key, item.value, item.size, i in chosen, reason))
+    return decisions
+
+
+def render_report(decisions: list[PackDecision], budget: int, unit: str = "chars") -> str:
+    """Render a markdown report of included and excluded items."""
+
+    def line(d: PackDecision) -> str:
+        return f"- {d.key[0]}/{d.key[1]}: {d.size} {unit}, value {d.value:.4f} — {d.reason}"
+
+    used = sum(d.size for d in decisions if d.included)
+    value = sum(d.value for d in decisions if d.included)
+    lines = [
+        "# Evidence Packing Report",
+        f"- budget: {used} / {budget} {unit}",
+        f"- value packed: {value:.4f} of {sum(d.value for d in decisions):.4f}",
+        "## Included",
+        *[line(d) for d in decisions if d.included],
+        "## Excluded",
+        *[line(d) for d in decisions if not d.included],
+    ]
+    return "\n".join(lines) + "\n"
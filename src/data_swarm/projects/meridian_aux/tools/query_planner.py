@@ -0,0 +1,148 @@
+"""Multi-term query planning and rank fusion over the symbol index."""
+
+from __future__ import annotations
+
+import math
+import re
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from data_swarm.projects.meridian_aux.tools.indexer import FTS_WEIGHTS, has_fts, search_index, split_identifier
+
+STOPWORDS = frozenset(
+    """
+    a about above after again all also an and any are as at be because been before being below between both
+    but by can could did do does doing done down during each either else ensure etc few for from further get
+    gets had has have having how if in into is it its just let like make makes may might more most must need
+    needs new no nor not now of off on once only or other our out over own please same should so some such
+    than that the their them then there these they this those through to too under until up use used uses
+    using via want was we were what when where which while who why will with would yet you your
+    """.split()
+)
+IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*")
+RRF_K = 60
+MAX_COMPOUND_SELECTS = 500  # SQLite's default SQLITE_MAX_COMPOUND_SELECT
+
+
+@dataclass
+class QueryTerm:
+    """One sub-query: an FTS5 expression and its IDF weight."""
+
+    text: str
+    match: str
+    weight: float = 1.0
+
+
+@dataclass
+class QueryPlan:
+    """Weighted sub-queries derived from a free-text task description."""
+
+    terms: list[QueryTerm] = field(default_factory=list)
+
+
+def extract_terms(text: str) -> list[tuple[str, str]]:
+    """Return ``(term, fts_match)`` candidates: identifiers as phrases plus their keyword parts."""
+    out: list[tuple[str, str]] = []
+    seen: set[str] = set()
+    for token in IDENTIFIER_RE.findall(text):
+        parts = [p for p in split_identifier(token) if len(p) > 1]
+        keywords = [p for p in parts if p not in STOPWORDS and len(p) > 2]
+        if len(parts) > 1 and keywords and token not in seen:
+            seen.add(token)
+            out.append((token, '"' + " ".join(parts) + '"'))
+        for part in keywords:
+            if part not in seen:
+                seen.add(part)
+                out.append((part, f'"{part}"*'))
+    return out
+
+
+def _idf(conn: sqlite3.Connection, terms: list[tuple[str, str]]) -> dict[str, float]:
+    total = conn.execute("SELECT COUNT(*) FROM symbols").fetchone()[0]
+    weights: dict[str, float] = {}
+    for start in range(0, len(terms), MAX_COMPOUND_SELECTS):
+        chunk = terms[start : start + MAX_COMPOUND_SELECTS]
+        sql = " UNION ALL ".join(
+            "SELECT ?, (SELECT COUNT(*) FROM symbols_fts WHERE symbols_fts MATCH ?)" for _ in chunk
+        )
+        params = [value for term, match in chunk for value in (term, match)]
+        for term, df in conn.execute(sql, params):
+            if df:
+                weights[term] = math.log((total - df + 0.5) / (df + 0.5) + 1.0)
+    return weights
+
+
+def plan_query(index_path: Path, text: str, max_terms: int = 8) -> QueryPlan:
+    """Extract keywords from ``text`` and keep the ``max_terms`` rarest ones present in the index."""
+    candidates = extract_terms(text)
+    if not candidates:
+        return QueryPlan()
+    with closing(sqlite3.connect(index_path)) as conn:
+        if not has_fts(conn):
+            return QueryPlan([QueryTerm(term, match) for term, match in candidates[:max_terms]])
+        weights = _idf(conn, candidates)
+    terms = [QueryTerm(term, match, weights[term]) for term, match in candidates if term in weights]
+    terms.sort(key=lambda t: t.weight, reverse=True)
+    return QueryPlan(terms[:max_terms])
+
+
+def _run_batched(conn: sqlite3.Connection, plan: QueryPlan, per_term: int) -> list[list[tuple]]:
+    sub = (
+        "SELECT * FROM (SELECT ? AS term_idx, s.repo, s.file_path, s.symbol, s.kind, s.lineno, "
+        "bm25(symbols_fts, ?, ?, ?, ?) AS score FROM symbols_fts JOIN symbols AS s ON s.id = symbols_fts.rowid "
+        "WHERE symbols_fts MATCH ? ORDER BY score LIMIT ?)"
+    )
+    ranked: list[list[tuple]] = [[] for _ in plan.terms]
+    for start in range(0, len(plan.terms), MAX_COMPOUND_SELECTS):
+        chunk = plan.terms[start : start + MAX_COMPOUND_SELECTS]
+        params: list[object] = []
+        for idx, term in enumerate(chunk, start=start):
+            params.extend([idx, *FTS_WEIGHTS, term.match, per_term])
+        for row in conn.execute(" UNION ALL ".join(sub for _ in chunk), params):
+            ranked[row[0]].append(row)
+    return [[r[1:6] for r in sorted(rows, key=lambda r: r[6])] for rows in ranked]
+
+
+def fused_search(
+    index_path: Path,
+    text: str,
+    limit: int = 5,
+    per_term: int = 25,
+    plan: QueryPlan | None = None,
+) -> list[dict[str, str]]:
+    """Run the planned sub-queries in as few round trips as SQLite allows and merge them with weighted RRF."""
+    plan = plan or plan_query(index_path, text)
+    if not plan.terms:
+        return []
+    with closing(sqlite3.connect(index_path)) as conn:
+        if has_fts(conn):
+            ranked = _run_batched(conn, plan, per_term)
+        else:
+            ranked = [
+                [
+                    (h["repo"], h["file_path"], h["symbol"], h["kind"], h["lineno"])
+                    for h in search_index(index_path, t.text, per_term)
+                ]
+                for t in plan.terms
+            ]
+    scores: dict[tuple, float] = {}
+    matched: dict[tuple, list[str]] = {}
+    for term, rows in zip(plan.terms, ranked, strict=True):
+        for rank, row in enumerate(rows, start=1):
+            scores[row] = scores.get(row, 0.0) + term.weight / (RRF_K + rank)
+            matched.setdefault(row, []).append(term.text)
+    best = sorted(scores, key=lambda r: scores[r], reverse=True)[:limit]
+    return [
+        {
+            "repo": r[0],
+            "file_path": r[1],
+            "symbol": r[2],
+            "kind": r[3],
+            "lineno": str(r[4]),
+            "score": f"{scores[r]:.6f}",
+            "terms": ", ".join(matched[r]),
+        }
+        for r in best
+    ]
@@ -2,31 +2,254 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
 from pathlib import Path
 
+from data_swarm.projects.meridian_aux.tools.packing import PackItem, pack, render_report
+from data_swarm.projects.meridian_aux.tools.skeleton import render_skeleton
+from data_swarm.stores.blob_store import BlobStore
+from data_swarm.tokens import TokenEstimator
+
 RepoFile = tuple[str, str]
 
+FULL_TIER = "full"
+SKELETON_TIER = "skeleton"
+
+
+def assign_tiers(
+    distances: dict[RepoFile, int],
+    files: list[RepoFile],
+    max_full_distance: int = 1,
+) -> dict[RepoFile, str]:
+    """Give files within ``max_full_distance`` import hops of an entrypoint full source, the rest skeletons."""
+    return {
+        f: FULL_TIER if distances.get(f, max_full_distance + 1) <= max_full_distance else SKELETON_TIER for f in files
+    }
+
+
+@dataclass(frozen=True)
+class SymbolSpan:
+    """Line span of an indexed class or function (1-based, inclusive)."""
+
+    symbol: str
+    kind: str
+    lineno: int
+    end_lineno: int
+
+
+IndexedDigest = tuple[str, int, int]
+
+
+def file_digests(index_path: Path, files: list[RepoFile]) -> dict[RepoFile, IndexedDigest]:
+    """Return the indexed ``(sha256, size, mtime_ns)`` of each of ``files``."""
+    sql = "SELECT sha256, size, mtime_ns FROM files WHERE repo = ? AND file_path = ?"
+    with closing(sqlite3.connect(index_path)) as conn:
+        rows = [conn.execute(sql, f).fetchone() for f in files]
+    return {f: (r[0], r[1], r[2]) for f, r in zip(files, rows, strict=True) if r and r[0]}
+
+
+def current_digest(src: Path, indexed: IndexedDigest | None) -> tuple[str, bytes | None]:
+    """Return ``src``'s sha256, trusting the index only while size and mtime still match.
+
+    The file's bytes are returned too when they had to be read.
+    """
+    if indexed is not None:
+        st = src.stat()
+        if (st.st_size, st.st_mtime_ns) == (indexed[1], indexed[2]):
+            return indexed[0], None
+    data = src.read_bytes()
+    return hashlib.sha256(data).hexdigest(), data
+
+
+def symbol_spans(index_path: Path, files: list[RepoFile]) -> dict[RepoFile, list[SymbolSpan]]:
+    """Load indexed symbol spans for ``files``."""
+    spans: dict[RepoFile, list[SymbolSpan]] = {}
+    with closing(sqlite3.connect(index_path)) as conn:
+        for repo, rel in files:
+            rows = conn.execute(
+                "SELECT symbol, kind, lineno, end_lineno FROM symbols WHERE repo = ? AND file_path = ? ORDER BY lineno",
+                (repo, rel),
+            ).fetchall()
+            spans[(repo, rel)] = [SymbolSpan(r[0], r[1], int(r[2]), int(r[3] or r[2])) for r in rows]
+    return spans
+
+
+def relevant_symbols(
+    index_path: Path,
+    files: list[RepoFile],
+    hits: list[dict[str, str]] | None = None,
+) -> dict[RepoFile, set[str]]:
+    """Return symbol names worth extracting per file.
+
+    A symbol is relevant when navigation matched it or when another selected
+    file imports it by name (``from module import name``).
+    """
+    selected = set(files)
+    focus: dict[RepoFile, set[str]] = {}
+    for hit in hits or []:
+        key = (hit["repo"], hit["file_path"])
+        if key in selected and hit.get("symbol"):
+            focus.setdefault(key, set()).add(hit["symbol"])
+    with closing(sqlite3.connect(index_path)) as conn:
+        for src in files:
+            rows = conn.execute(
+                "SELECT DISTINCT e.dst_repo, e.dst_file, i.imported_name FROM edges AS e "
+                "JOIN imports AS i ON i.repo = e.src_repo AND i.file_path = e.src_file "
+                "AND i.imported_module = e.import "
+                "WHERE e.src_repo = ? AND e.src_file = ? AND i.imported_name != ''",
+                src,
+            ).fetchall()
+            for dst_repo, dst_file, name in rows:
+                if (dst_repo, dst_file) in selected:
+                    focus.setdefault((dst_repo, dst_file), set()).add(name)
+    return focus
+
+
+def extract_symbols(text: str, spans: list[SymbolSpan], names: set[str]) -> str | None:
+    """Return the module header plus the spans of ``names``; ``None`` when nothing matches.
+
+    The header is every line before the first top-level definition (docstring,
+    imports, constants). Methods are emitted under their enclosing class line.
+    """
+    lines = text.splitlines()
+    wanted = [s for s in spans if s.symbol in names]
+    if not wanted:
+        return None
+    top_level = [s for s in spans if not any(o is not s and o.lineno < s.lineno <= o.end_lineno for o in spans)]
+    header_end = min((s.lineno for s in top_level), default=len(lines) + 1) - 1
+    while header_end > 0 and lines[header_end - 1].lstrip().startswith("@"):
+        header_end -= 1
+    keep: set[int] = set(range(1, header_end + 1))
+    for span in wanted:
+        start = span.lineno
+        while start > 1 and lines[start - 2].lstrip().startswith("@"):
+            start -= 1
+        keep.update(range(start, span.end_lineno + 1))
+        for outer in spans:
+            if outer.kind == "ClassDef" and outer.lineno < span.lineno <= outer.end_lineno:
+                keep.add(outer.lineno)
+    out: list[str] = []
+    previous = 0
+    for number in sorted(n for n in keep if n <= len(lines)):
+        if previous and number != previous + 1:
+            line = lines[number - 1]
+            out.append(line[: len(line) - len(line.lstrip())] + "...")
+        out.append(lines[number - 1])
+        previous = number
+    if previous < len(lines):
+        out.append("...")
+    return "\n".join(out) + "\n"
+
+
+def _snippet_name(idx: int, repo: str, rel: str) -> str:
+    return f"{idx:02d}_{repo}__{rel.replace('/', '_')}"
+
+
+def extraction_mode(tier: str | None, names: set[str] | None) -> str:
+    """Return the blob-store key for how a file was reduced: full, skeleton or a symbol set."""
+    if tier == SKELETON_TIER:
+        return SKELETON_TIER
+    if names:
+        return "symbols:" + hashlib.sha256(",".join(sorted(names)).encode("utf-8")).hexdigest()[:16]
+    return FULL_TIER
+
 
 def collect_snippets(
     repos: dict[str, Path],
     files: list[RepoFile],
     out_dir: Path,
     max_chars: int,
-) -> tuple[list[Path], int]:
-    """Copy selected file snippets into evidence folder."""
+    focus: dict[RepoFile, set[str]] | None = None,
+    spans: dict[RepoFile, list[SymbolSpan]] | None = None,
+    values: dict[RepoFile, float] | None = None,
+    report_path: Path | None = None,
+    tiers: dict[RepoFile, str] | None = None,
+    max_tokens: int | None = None,
+    estimator: TokenEstimator | None = None,
+    store: BlobStore | None = None,
+    digests: dict[RepoFile, IndexedDigest] | None = None,
+) -> tuple[list[Path], int, dict[Path, RepoFile]]:
+    """Copy selected file snippets into evidence folder.
+
+    Returns the snippet paths, their total characters and the source file
+    of each snippet.
+
+    Files in the ``skeleton`` tier (see ``tiers``) are reduced to signatures.
+    Otherwise, with ``focus`` and ``spans``, files that have relevant symbols
+    are cut down to their header and those symbols; other files are copied whole. Snippets
+    are packed into ``max_chars`` by relevance ``values`` (default: earlier
+    files first) and the packing decisions go to ``report_path`` when given.
+    With ``max_tokens`` and an ``estimator`` the budget is counted in
+    estimated tokens instead of characters. With a ``store``, extracted text
+    is cached by the live source sha256 and extraction mode (``digests`` from
+    the index skip re-hashing files whose size and mtime are unchanged), and
+    snippets are hardlinked from the store with a ``manifest.json`` recording
+    each blob.
+    """
+    by_tokens = bool(max_tokens) and estimator is not None
     out_dir.mkdir(parents=True, exist_ok=True)
-    used: list[Path] = []
-    chars = 0
+    texts: dict[int, str] = {}
+    blobs: dict[int, str] = {}
+    manifest: dict[str, dict[str, str]] = {}
+    items: list[PackItem] = []
     for idx, (repo, rel) in enumerate(files):
         src = repos[repo] / rel
         if not src.exists():
             continue
-        text = src.read_text(encoding="utf-8")
-        if chars + len(text) > max_chars:
-            break
+        tier = (tiers or {}).get((repo, rel))
+        names = (focus or {}).get((repo, rel)) if spans else None
+        mode = extraction_mode(tier, names)
+        digest: str | None = None
+        data: bytes | None = None
+        if store is not None:
+            digest, data = current_digest(src, (digests or {}).get((repo, rel)))
+        blob = store.lookup(digest, mode) if store is not None else None
+        if blob is not None:
+            text = store.read(blob)
+        else:
+            text = (data if data is not None else src.read_bytes()).decode("utf-8")
+            if tier == SKELETON_TIER:
+                text = render_skeleton(text)
+            elif names:
+                text = extract_symbols(text, spans.get((repo, rel), []), names) or text
+            if store is not None:
+                blob = store.put(text, digest, mode)
+        texts[idx] = text
+        if blob is not None:
+            blobs[idx] = blob
+            manifest[_snippet_name(idx, repo, rel)] = {"blob": blob, "source": digest, "mode": mode}
+        value = (values or {}).get((repo, rel), 1.0 / (idx + 1))
+        size = estimator.count(text) if by_tokens else len(text)
+        items.append(PackItem((repo, rel), value, size))
+    budget = int(max_tokens) if by_tokens else max_chars
+    decisions = pack(items, budget)
+    if report_path is not None:
+        report_path.write_text(render_report(decisions, budget, "tokens" if by_tokens else "chars"), encoding="utf-8")
+    included = {d.key for d in decisions if d.included}
+    used: list[Path] = []
+    sources: dict[Path, RepoFile] = {}
+    chars = 0
+    for idx, text in texts.items():
+        repo, rel = files[idx]
+        if (repo, rel) not in included:
+            continue
         chars += len(text)
-        sanitized = rel.replace("/", "_")
-        dest = out_dir / f"{idx:02d}_{repo}__{sanitized}"
-        dest.write_text(text, encoding="utf-8")
+        dest = out_dir / _snippet_name(idx, repo, rel)
+        if idx in blobs:
+            store.link(blobs[idx], dest)
+        else:
+            # An earlier store-backed run may have left a read-only hardlink to a shared blob here.
+            dest.unlink(missing_ok=True)
+            dest.write_text(text, encoding="utf-8")
         used.append(dest)
-    return used, chars
+        sources[dest] = (repo, rel)
+    if store is not None:
+        kept = {p.name for p in used}
+        (out_dir / "manifest.json").write_text(
+            json.dumps({k: v for k, v in manifest.items() if k in kept}, indent=2), encoding="utf-8"
+        )
+    return used, chars, sources
@@ -0,0 +1,55 @@
+"""Signature-only skeletons of Python modules for low-priority evidence."""
+
+from __future__ import annotations
+
+import ast
+
+MAX_VALUE_CHARS = 80
+
+
+def _doc_stub(node: ast.AST) -> list[ast.stmt]:
+    doc = ast.get_docstring(node, clean=True)
+    if not doc:
+        return []
+    return [ast.Expr(ast.Constant(doc.strip().splitlines()[0]))]
+
+
+def _short_value(value: ast.expr | None) -> ast.expr | None:
+    if value is None or len(ast.unparse(value)) <= MAX_VALUE_CHARS:
+        return value
+    return ast.Constant(...)
+
+
+def _skeleton_body(body: list[ast.stmt], in_class: bool) -> list[ast.stmt]:
+    out: list[ast.stmt] = []
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            node.body = [*_doc_stub(node), ast.Expr(ast.Constant(...))]
+            out.append(node)
+        elif isinstance(node, ast.ClassDef):
+            inner = _skeleton_body(node.body, in_class=True)
+            node.body = [*_doc_stub(node), *inner] or [ast.Expr(ast.Constant(...))]
+            out.append(node)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)) and not in_class:
+            out.append(node)
+        elif isinstance(node, ast.AnnAssign) and node.simple:
+            node.value = _short_value(node.value)
+            out.append(node)
+        elif isinstance(node, ast.Assign) and all(isinstance(t, ast.Name) and t.id[:1].isupper() for t in node.targets):
+            node.value = _short_value(node.value)
+            out.append(node)
+    return out
+
+
+def render_skeleton(source: str) -> str:
+    """Return class/def signatures with type hints and first docstring lines; bodies become ``...``.
+
+    Imports, annotated attributes, constants and type aliases (long values
+    elided) are kept so the API shape stays readable. Unparseable sources are returned unchanged.
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return source
+    tree.body = [*_doc_stub(tree), *_skeleton_body(tree.body, in_class=False)]
+    return ast.unparse(tree) + "\n"
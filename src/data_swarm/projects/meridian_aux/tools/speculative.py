@@ -0,0 +1,133 @@
+"""Test debug candidate patches in parallel, each in its own git worktree."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import cast
+
+from data_swarm.projects.meridian_aux.tools.test_runner import run_pytest, run_snippet
+from data_swarm.tools.diff import PatchSafetyError, apply_patch_safe, summarize_patch
+
+_WORKTREE_LOCK = threading.Lock()
+
+
+def _tree_env(tree: Path) -> dict[str, str]:
+    """Environment that imports from ``tree`` first; the snippet's own directory is on sys.path otherwise."""
+    paths = [str(tree), os.environ.get("PYTHONPATH", "")]
+    return {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in paths if p)}
+
+
+@dataclass
+class CandidateResult:
+    """Outcome of one candidate patch tested in isolation."""
+
+    index: int
+    patch: str
+    probe_snippet: str
+    notes: str
+    diff_size: int
+    applied: bool = False
+    snippet_exit: int | None = None
+    pytest_exit: int | None = None
+    error: str = ""
+
+    @property
+    def passed(self) -> bool:
+        """Return whether the patch applied and both snippet and pytest exited 0."""
+        return self.applied and self.snippet_exit == 0 and self.pytest_exit == 0
+
+
+def diff_size(patch: str) -> int:
+    """Return added plus removed lines of a unified diff."""
+    summary = summarize_patch(patch)
+    return cast(int, summary["added"]) + cast(int, summary["removed"])
+
+
+def _git(repo: Path, *args: str, stdin: str | None = None) -> str:
+    proc = subprocess.run(["git", "-C", str(repo), *args], input=stdin, capture_output=True, text=True, check=True)
+    return proc.stdout
+
+
+def add_worktree(repo: Path, dest: Path) -> None:
+    """Check out ``repo``'s HEAD at ``dest`` and replay its uncommitted and untracked changes there."""
+    with _WORKTREE_LOCK:
+        _git(repo, "worktree", "add", "--detach", str(dest), "HEAD")
+    changes = _git(repo, "diff", "HEAD", "--binary")
+    if changes.strip():
+        _git(dest, "apply", "--whitespace=nowarn", "-", stdin=changes)
+    for rel in _git(repo, "ls-files", "--others", "--exclude-standard", "-z").split("\0"):
+        if rel:
+            (dest / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(repo / rel, dest / rel)
+
+
+def remove_worktree(repo: Path, dest: Path) -> None:
+    """Remove a worktree created by :func:`add_worktree`."""
+    with _WORKTREE_LOCK:
+        subprocess.run(["git", "-C", str(repo), "worktree", "remove", "--force", str(dest)], capture_output=True)
+        subprocess.run(["git", "-C", str(repo), "worktree", "prune"], capture_output=True)
+
+
+def try_candidate(repo: Path, candidate: CandidateResult, snippet: Path, workdir: Path) -> CandidateResult:
+    """Apply ``candidate`` in a fresh worktree of ``repo`` and run its probe snippet (or ``snippet``) and pytest."""
+    out = workdir / f"candidate_{candidate.index}"
+    out.mkdir(parents=True, exist_ok=True)
+    (out / "patch.diff").write_text(candidate.patch, encoding="utf-8")
+    if candidate.probe_snippet:
+        snippet = out / "snippet.py"
+        snippet.write_text(candidate.probe_snippet, encoding="utf-8")
+    with tempfile.TemporaryDirectory(prefix="data-swarm-wt-") as tmp:
+        tree = Path(tmp) / repo.name
+        try:
+            add_worktree(repo, tree)
+            apply_patch_safe(candidate.patch, tree)
+        except (subprocess.CalledProcessError, PatchSafetyError) as exc:
+            candidate.error = f"{type(exc).__name__}: {getattr(exc, 'stderr', '') or exc}".strip()
+            remove_worktree(repo, tree)
+            return candidate
+        candidate.applied = True
+        try:
+            candidate.snippet_exit, s_out, s_err = run_snippet(snippet.resolve(), tree, _tree_env(tree))
+            candidate.pytest_exit, p_out, p_err = run_pytest(tree)
+        finally:
+            remove_worktree(repo, tree)
+    (out / "stdout.txt").write_text(s_out + "\n" + p_out, encoding="utf-8")
+    (out / "stderr.txt").write_text(s_err + "\n" + p_err, encoding="utf-8")
+    return candidate
+
+
+def evaluate_candidates(
+    repo: Path,
+    candidates: list[dict[str, str]],
+    snippet: Path,
+    workdir: Path,
+    jobs: int = 0,
+) -> list[CandidateResult]:
+    """Test every candidate with a patch concurrently (``jobs`` workers, 0 = one per candidate)."""
+    results = [
+        CandidateResult(
+            index=i,
+            patch=c.get("patch", ""),
+            probe_snippet=c.get("probe_snippet", ""),
+            notes=c.get("notes", ""),
+            diff_size=diff_size(c.get("patch", "")),
+        )
+        for i, c in enumerate(candidates, start=1)
+        if c.get("patch")
+    ]
+    if not results:
+        return []
+    with ThreadPoolExecutor(max_workers=jobs or len(results)) as pool:
+        return list(pool.map(lambda c: try_candidate(repo, c, snippet, workdir), results))
+
+
+def rank_passing(results: list[CandidateResult]) -> list[CandidateResult]:
+    """Return passing candidates, smallest diff first."""
+    return sorted((r for r in results if r.passed), key=lambda r: (r.diff_size, r.index))
@@ -0,0 +1,66 @@
+"""Incremental parsing of streamed YAML agent payloads."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import yaml
+
+KEY_RE = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*):(?:\s|$)")
+
+
+class SectionStreamParser:
+    """Split a streamed YAML mapping into its top-level ``keys`` as they complete.
+
+    A section is complete once the next top-level key starts (or the stream
+    closes); it is then parsed on its own and passed to ``on_section(key,
+    value)``. Code fences are ignored. Sections that fail to parse are
+    skipped; callers still parse the full text at the end.
+    """
+
+    def __init__(self, keys: Iterable[str], on_section: Callable[[str, Any], None]) -> None:
+        self.keys = set(keys)
+        self.on_section = on_section
+        self.sections: dict[str, Any] = {}
+        self._partial = ""
+        self._key: str | None = None
+        self._lines: list[str] = []
+
+    def feed(self, delta: str) -> None:
+        """Consume a text delta."""
+        self._partial += delta
+        *complete, self._partial = self._partial.split("\n")
+        for line in complete:
+            self._line(line)
+
+    def close(self) -> None:
+        """Flush the final section."""
+        if self._partial:
+            self._line(self._partial)
+            self._partial = ""
+        self._finish()
+
+    def _line(self, line: str) -> None:
+        if line.startswith("```"):
+            return
+        match = KEY_RE.match(line)
+        if match and match.group(1) in self.keys:
+            self._finish()
+            self._key = match.group(1)
+        if self._key is not None:
+            self._lines.append(line)
+
+    def _finish(self) -> None:
+        if self._key is None:
+            return
+        key, text = self._key, "\n".join(self._lines) + "\n"
+        self._key, self._lines = None, []
+        try:
+            parsed = yaml.safe_load(text)
+        except yaml.YAMLError:
+            return
+        if isinstance(parsed, dict) and key in parsed:
+            self.sections[key] = parsed[key]
+            self.on_section(key, parsed[key])
@@ -7,9 +7,9 @@ import sys
 from pathlib import Path
 
 
-def run_snippet(snippet: Path, cwd: Path) -> tuple[int, str, str]:
-    """Execute python snippet."""
-    proc = subprocess.run([sys.executable, str(snippet)], cwd=cwd, capture_output=True, text=True)
+def run_snippet(snippet: Path, cwd: Path, env: dict[str, str] | None = None) -> tuple[int, str, str]:
+    """Execute python snippet; ``env`` replaces the inherited environment when given."""
+    proc = subprocess.run([sys.executable, str(snippet)], cwd=cwd, env=env, capture_output=True, text=True)
     return proc.returncode, proc.stdout, proc.stderr
 
 
@@ -0,0 +1,120 @@
+"""Stable-prefix prompt assembly so provider-side prompt caching can hit."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from data_swarm.kb import render_stage_policy
+from data_swarm.tokens import TokenEstimator
+
+SECTION_SEPARATOR = "\n\n"
+PREFIX_TTL_SECONDS = 300.0
+MIN_CACHEABLE_PREFIX_TOKENS = 1024
+
+
+def canonical_text(text: str) -> str:
+    """Normalise newlines and trailing whitespace so equal content renders byte-identically."""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def policy_pack_hash(policy: dict[str, Any] | None) -> str:
+    """Return the sha256 of a policy pack's canonical JSON."""
+    return _digest(json.dumps(policy or {}, sort_keys=True, ensure_ascii=False))
+
+
+class AssembledPrompt(str):
+    """Prompt text carrying its stable-prefix stats; providers treat it as a plain ``str``."""
+
+    prefix_hash: str = ""
+    prefix_tokens: int = 0
+    total_tokens: int = 0
+    cached_prefix_tokens: int = 0
+
+    @property
+    def cached_prefix_ratio(self) -> float:
+        """Share of prompt tokens expected to be served from the provider's prefix cache."""
+        return self.cached_prefix_tokens / self.total_tokens if self.total_tokens else 0.0
+
+
+_LOCK = threading.Lock()
+_PREFIXES: dict[tuple[str, str], str] = {}
+_LAST_SENT: dict[tuple[str, str], float] = {}
+
+
+def rendered_prefix(system: str, policy: dict[str, Any] | None = None) -> str:
+    """Return system instructions followed by the rendered policy pack, cached per (system, policy-pack) hash."""
+    key = (_digest(system), policy_pack_hash(policy))
+    with _LOCK:
+        cached = _PREFIXES.get(key)
+    if cached is not None:
+        return cached
+    parts = [canonical_text(system), canonical_text(render_stage_policy(policy or {}))]
+    text = SECTION_SEPARATOR.join(p for p in parts if p)
+    with _LOCK:
+        return _PREFIXES.setdefault(key, text)
+
+
+def reset_prefix_cache() -> None:
+    """Forget rendered prefixes and prefix send times."""
+    with _LOCK:
+        _PREFIXES.clear()
+        _LAST_SENT.clear()
+
+
+class PromptAssembler:
+    """Build prompts as stable prefix (system, policy, stable task content) followed by variable content.
+
+    A prefix sent for the same model within ``ttl_seconds`` is assumed warm
+    in the provider's prompt cache when it has at least ``min_prefix_tokens``
+    tokens; :attr:`AssembledPrompt.cached_prefix_ratio` reports that share.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        ttl_seconds: float = PREFIX_TTL_SECONDS,
+        min_prefix_tokens: int = MIN_CACHEABLE_PREFIX_TOKENS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.model = model
+        self.estimator = TokenEstimator(model)
+        self.ttl_seconds = ttl_seconds
+        self.min_prefix_tokens = min_prefix_tokens
+        self.clock = clock
+
+    def prefix(self, system: str, policy: dict[str, Any] | None = None, stable: list[str] | None = None) -> str:
+        """Return the byte-stable prefix, ending with a section separator."""
+        parts = [rendered_prefix(system, policy), *(canonical_text(s) for s in stable or [])]
+        return SECTION_SEPARATOR.join(p for p in parts if p) + SECTION_SEPARATOR
+
+    def assemble(
+        self,
+        system: str,
+        variable: list[str],
+        policy: dict[str, Any] | None = None,
+        stable: list[str] | None = None,
+    ) -> AssembledPrompt:
+        """Return prefix + variable sections (kept verbatim) with prefix stats attached."""
+        prefix = self.prefix(system, policy, stable)
+        prompt = AssembledPrompt(prefix + SECTION_SEPARATOR.join(variable))
+        prompt.prefix_hash = _digest(prefix)
+        prompt.prefix_tokens = self.estimator.count(prefix)
+        prompt.total_tokens = self.estimator.count(prompt)
+        now = self.clock()
+        with _LOCK:
+            last = _LAST_SENT.get((self.model, prompt.prefix_hash))
+            _LAST_SENT[(self.model, prompt.prefix_hash)] = now
+        warm = last is not None and now - last <= self.ttl_seconds
+        if warm and prompt.prefix_tokens >= self.min_prefix_tokens:
+            prompt.cached_prefix_tokens = prompt.prefix_tokens
+        return prompt
@@ -0,0 +1,192 @@
+"""Client-side rate limiting and adaptive retry for LLM calls."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504})
+RETRYABLE_NAMES = frozenset({"APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError"})
+
+
+@dataclass(frozen=True)
+class CallPolicy:
+    """Per-model request/token limits (0 = unlimited) and retry settings."""
+
+    rpm: int = 0
+    tpm: int = 0
+    max_attempts: int = 5
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 30.0
+
+    @classmethod
+    def from_config(cls, llm: dict[str, Any] | None, model: str) -> CallPolicy:
+        """Combine ``llm.retry`` with ``llm.rate_limits[model]`` (falling back to ``rate_limits.default``)."""
+        llm = llm or {}
+        limits = llm.get("rate_limits") or {}
+        model_limits = limits.get(model) or limits.get("default") or {}
+        retry = llm.get("retry") or {}
+        default = cls()
+        return cls(
+            rpm=int(model_limits.get("rpm", 0)),
+            tpm=int(model_limits.get("tpm", 0)),
+            max_attempts=int(retry.get("max_attempts", default.max_attempts)),
+            base_delay_seconds=float(retry.get("base_delay_seconds", default.base_delay_seconds)),
+            max_delay_seconds=float(retry.get("max_delay_seconds", default.max_delay_seconds)),
+        )
+
+
+class TokenBucket:
+    """Reservation-based token bucket refilled at ``per_minute / 60`` per second.
+
+    :meth:`reserve` always takes the amount, letting the level go negative;
+    the returned wait is how long until that debt is repaid, so concurrent
+    callers queue up in reservation order.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` (capped at capacity) and return seconds to wait before using it."""
+        with self._lock:
+            now = self.clock()
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+            self.level -= min(amount, self.capacity)
+            return 0.0 if self.level >= 0 else -self.level / self.rate
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets for one model."""
+
+    def __init__(self, rpm: int = 0, tpm: int = 0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.requests = TokenBucket(rpm, clock) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm, clock) if tpm > 0 else None
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve one request and ``tokens`` tokens; return the wait in seconds."""
+        waits = [0.0]
+        if self.requests is not None:
+            waits.append(self.requests.reserve(1))
+        if self.tokens is not None:
+            waits.append(self.tokens.reserve(tokens))
+        return max(waits)
+
+    def acquire(self, tokens: int, sleep: Callable[[float], None] = time.sleep) -> float:
+        """Block until one request with ``tokens`` tokens may start; return the time waited."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: int) -> float:
+        """Async :meth:`acquire`."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def settle(self, extra_tokens: int) -> None:
+        """Charge tokens learned after the call (e.g. output usage) without waiting."""
+        if self.tokens is not None and extra_tokens > 0:
+            self.tokens.reserve(extra_tokens)
+
+
+_LOCK = threading.Lock()
+_LIMITERS: dict[tuple[str, int, int], RateLimiter] = {}
+
+
+def shared_limiter(model: str, policy: CallPolicy) -> RateLimiter:
+    """Return the process-wide limiter for ``model`` so concurrent callers share its budget."""
+    with _LOCK:
+        limiter = _LIMITERS.get((model, policy.rpm, policy.tpm))
+        if limiter is None:
+            limiter = _LIMITERS[(model, policy.rpm, policy.tpm)] = RateLimiter(policy.rpm, policy.tpm)
+        return limiter
+
+
+def _status(exc: BaseException) -> int | None:
+    for attr in ("status_code", "code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Return whether ``exc`` is a rate limit, timeout or transient server/connection error."""
+    status = _status(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return type(exc).__name__ in RETRYABLE_NAMES or isinstance(exc, (ConnectionError, TimeoutError))
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Return the server's retry hint in seconds (``retry-after-ms`` or ``retry-after``), if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None) or getattr(exc, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, policy: CallPolicy, hint: float | None = None) -> float:
+    """Full-jitter exponential delay for retry ``attempt`` (0-based), capped at ``max_delay_seconds``.
+
+    A server hint is a floor and is honored even beyond the cap.
+    """
+    ceiling = min(policy.max_delay_seconds, policy.base_delay_seconds * 2**attempt)
+    delay = random.uniform(0, ceiling)
+    return max(delay, hint) if hint is not None else delay
+
+
+def call_with_retry(
+    fn: Callable[[], T],
+    policy: CallPolicy,
+    sleep: Callable[[float], None] = time.sleep,
+) -> T:
+    """Call ``fn``, retrying retryable errors with backoff; the last error is re-raised."""
+    for attempt in range(max(1, policy.max_attempts)):
+        try:
+            return fn()
+        except Exception as exc:
+            if not is_retryable(exc) or attempt + 1 >= policy.max_attempts:
+                raise
+            sleep(backoff_delay(attempt, policy, retry_after(exc)))
+    raise AssertionError("unreachable")
+
+
+async def call_with_retry_async(fn: Callable[[], Awaitable[T]], policy: CallPolicy) -> T:
+    """Async :func:`call_with_retry`."""
+    for attempt in range(max(1, policy.max_attempts)):
+        try:
+            return await fn()
+        except Exception as exc:
+            if not is_retryable(exc) or attempt + 1 >= policy.max_attempts:
+                raise
+            await asyncio.sleep(backoff_delay(attempt, policy, retry_after(exc)))
+    raise AssertionError("unreachable")
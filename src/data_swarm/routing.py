@@ -0,0 +1,112 @@
+"""Per-role model routing with timeout and token budgets."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from data_swarm.llm import LLMTimeoutError, LLMTransientError, Provider
+from data_swarm.tokens import TokenEstimator
+
+
+@dataclass(frozen=True)
+class Route:
+    """Model for one agent role, its budgets (0 = unlimited) and the cheaper fallback model."""
+
+    model: str
+    timeout_seconds: float = 60.0
+    max_prompt_tokens: int = 0
+    token_budget: int = 0
+    fallback_model: str = ""
+
+    @classmethod
+    def from_config(cls, llm: dict[str, Any], role: str) -> Route:
+        """Read ``llm.routing[role]`` (falling back to ``routing.default``); unset fields come from ``llm``."""
+        routes = llm.get("routing") or {}
+        entry = routes.get(role) or routes.get("default") or {}
+        return cls(
+            model=str(entry.get("model") or llm["model"]),
+            timeout_seconds=float(entry.get("timeout_seconds") or llm.get("timeout_seconds", 60)),
+            max_prompt_tokens=int(entry.get("max_prompt_tokens") or 0),
+            token_budget=int(entry.get("token_budget") or 0),
+            fallback_model=str(entry.get("fallback_model") or ""),
+        )
+
+
+class RoutedProvider:
+    """Send calls to the role's primary provider unless a budget says otherwise.
+
+    The ``fallback`` provider (the route's cheaper model) is used when the
+    prompt exceeds ``max_prompt_tokens``, when it would take the role past
+    its cumulative ``token_budget``, or when the primary times out or stays
+    rate limited. ``on_route(model, reason)`` is called for every call that
+    leaves the primary; the choice is also kept in ``last_model`` and
+    ``last_reason``.
+    """
+
+    def __init__(
+        self,
+        route: Route,
+        primary: Provider,
+        fallback: Provider | None = None,
+        on_route: Callable[[str, str], None] | None = None,
+    ) -> None:
+        self.route = route
+        self.primary = primary
+        self.fallback = fallback
+        self.on_route = on_route
+        self.model = primary.model
+        self.estimator = TokenEstimator(primary.model)
+        self.used_tokens = 0
+        self.last_model = primary.model
+        self.last_reason = ""
+
+    def _budget_reason(self, tokens: int) -> str:
+        if self.route.max_prompt_tokens and tokens > self.route.max_prompt_tokens:
+            return "max_prompt_tokens"
+        if self.route.token_budget and self.used_tokens + tokens > self.route.token_budget:
+            return "token_budget"
+        return ""
+
+    def _choose(self, prompt: str) -> Provider:
+        tokens = self.estimator.count(prompt)
+        reason = self._budget_reason(tokens) if self.fallback is not None else ""
+        self.used_tokens += tokens
+        return self._use(self.fallback, reason) if reason else self._use(self.primary, "")
+
+    def _use(self, provider: Provider | None, reason: str) -> Provider:
+        assert provider is not None
+        self.last_model, self.last_reason = provider.model, reason
+        if reason and self.on_route is not None:
+            self.on_route(provider.model, reason)
+        return provider
+
+    def complete(self, prompt: str) -> str:
+        """Complete on the routed model, retrying once on the fallback after a timeout or rate limit."""
+        provider = self._choose(prompt)
+        try:
+            return provider.complete(prompt)
+        except (LLMTimeoutError, LLMTransientError) as exc:
+            if provider is not self.primary or self.fallback is None:
+                raise
+            return self._use(self.fallback, type(exc).__name__).complete(prompt)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Stream from the routed model; falls back like :meth:`complete` if nothing was yielded yet."""
+        provider = self._choose(prompt)
+        started = False
+        try:
+            for delta in _stream(provider, prompt):
+                started = True
+                yield delta
+        except (LLMTimeoutError, LLMTransientError) as exc:
+            if started or provider is not self.primary or self.fallback is None:
+                raise
+            yield from _stream(self._use(self.fallback, type(exc).__name__), prompt)
+
+
+def _stream(provider: Provider, prompt: str) -> Iterator[str]:
+    if hasattr(provider, "stream"):
+        return provider.stream(prompt)
+    return iter([provider.complete(prompt)])
@@ -0,0 +1,129 @@
+"""Content-addressed, reference-counted blob store shared across tasks."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import closing
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS extracts (
+    source_digest TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    blob TEXT NOT NULL,
+    PRIMARY KEY (source_digest, mode)
+);
+CREATE TABLE IF NOT EXISTS refs (
+    path TEXT PRIMARY KEY,
+    blob TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_refs_blob ON refs(blob);
+"""
+
+
+class BlobStore:
+    """Store text blobs under ``DATA_SWARM_HOME/blobs`` keyed by their sha256.
+
+    ``extracts`` maps a source file digest plus extraction mode to the blob
+    holding the extracted text, so unchanged files skip re-extraction. Task
+    directories reference blobs through hardlinks (copies when linking fails);
+    each reference is recorded in ``refs`` and :meth:`gc` deletes blobs no
+    live reference points to.
+    """
+
+    def __init__(self, home: Path) -> None:
+        self.root = home / "blobs"
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / "blobs.sqlite"
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def path(self, digest: str) -> Path:
+        """Return the object path for ``digest``."""
+        return self.objects / digest[:2] / digest
+
+    def lookup(self, source_digest: str, mode: str) -> str | None:
+        """Return the blob digest cached for ``source_digest`` extracted with ``mode``."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT blob FROM extracts WHERE source_digest = ? AND mode = ?", (source_digest, mode)
+            ).fetchone()
+        return row[0] if row and self.path(row[0]).exists() else None
+
+    def read(self, digest: str) -> str:
+        """Return the text of blob ``digest``."""
+        return self.path(digest).read_text(encoding="utf-8")
+
+    def put(self, text: str, source_digest: str | None = None, mode: str | None = None) -> str:
+        """Store ``text`` (once per content) and optionally record it as an extract; return its digest."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        target = self.path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(tmp, 0o444)
+            os.replace(tmp, target)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR IGNORE INTO blobs (digest, size) VALUES (?, ?)", (digest, len(data)))
+            if source_digest and mode:
+                conn.execute(
+                    "INSERT OR REPLACE INTO extracts (source_digest, mode, blob) VALUES (?, ?, ?)",
+                    (source_digest, mode, digest),
+                )
+        return digest
+
+    def link(self, digest: str, dest: Path) -> Path:
+        """Materialize blob ``digest`` at ``dest`` as a hardlink (copy as fallback) and record the reference."""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.unlink(missing_ok=True)
+        try:
+            os.link(self.path(digest), dest)
+        except OSError:
+            shutil.copyfile(self.path(digest), dest)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO refs (path, blob) VALUES (?, ?)", (str(dest.resolve()), digest))
+        return dest
+
+    def _is_link(self, path: Path, digest: str) -> bool:
+        try:
+            st, blob = path.stat(), self.path(digest).stat()
+        except FileNotFoundError:
+            return False
+        return (st.st_dev, st.st_ino) == (blob.st_dev, blob.st_ino)
+
+    def gc(self) -> dict[str, int]:
+        """Drop references whose path is gone or no longer links the blob, then delete unreferenced blobs."""
+        stats = {"refs_dropped": 0, "blobs_removed": 0, "bytes_freed": 0}
+        with closing(self._connect()) as conn, conn:
+            refs = conn.execute("SELECT path, blob FROM refs").fetchall()
+            stale = [(path,) for path, blob in refs if not self._is_link(Path(path), blob)]
+            conn.executemany("DELETE FROM refs WHERE path = ?", stale)
+            stats["refs_dropped"] = len(stale)
+            orphans = conn.execute(
+                "SELECT digest, size FROM blobs WHERE digest NOT IN (SELECT blob FROM refs)"
+            ).fetchall()
+            for digest, size in orphans:
+                self.path(digest).unlink(missing_ok=True)
+                stats["bytes_freed"] += size
+            conn.executemany("DELETE FROM extracts WHERE blob = ?", [(d,) for d, _ in orphans])
+            conn.executemany("DELETE FROM blobs WHERE digest = ?", [(d,) for d, _ in orphans])
+            stats["blobs_removed"] = len(orphans)
+        return stats
@@ -0,0 +1,115 @@
+"""On-disk LLM response cache with TTL expiry and size-bounded LRU eviction."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access);
+"""
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize line endings and trailing whitespace so cosmetic edits still hit."""
+    return "\n".join(line.rstrip() for line in prompt.replace("\r\n", "\n").split("\n")).strip()
+
+
+def cache_key(model: str, prompt: str, params: dict[str, Any] | None = None) -> str:
+    """Return the cache key for ``model``, the normalized ``prompt`` and call ``params``."""
+    payload = json.dumps([model, normalize_prompt(prompt), params or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed response cache at ``DATA_SWARM_HOME/cache/llm.sqlite``.
+
+    Entries older than ``ttl_seconds`` are misses. When stored responses
+    exceed ``max_bytes`` the least recently used entries are evicted. With
+    ``bypass`` lookups always miss but fresh responses are still stored.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float = 7 * 86400,
+        max_bytes: int = 64 * 2**20,
+        bypass: bool = False,
+    ) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.counters = {"hits": 0, "misses": 0, "bypassed": 0, "evicted": 0}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+
+    @classmethod
+    def from_config(cls, home: Path, cache_cfg: dict[str, Any] | None) -> LLMCache:
+        """Build the cache from the ``llm.cache`` config section."""
+        cache_cfg = cache_cfg or {}
+        return cls(
+            home / "cache" / "llm.sqlite",
+            ttl_seconds=float(cache_cfg.get("ttl_seconds", 7 * 86400)),
+            max_bytes=int(float(cache_cfg.get("max_mb", 64)) * 2**20),
+            bypass=bool(cache_cfg.get("bypass", False)),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get(self, model: str, prompt: str, params: dict[str, Any] | None = None) -> str | None:
+        """Return the cached response or ``None`` (expired entries are dropped)."""
+        if self.bypass:
+            self.counters["bypassed"] += 1
+            return None
+        key = cache_key(model, prompt, params)
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] <= self.ttl_seconds:
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                self.counters["hits"] += 1
+                return row[0]
+            if row:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self.counters["misses"] += 1
+        return None
+
+    def put(self, model: str, prompt: str, response: str, params: dict[str, Any] | None = None) -> None:
+        """Store ``response`` and evict least recently used entries beyond ``max_bytes``."""
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key(model, prompt, params), model, response, size, now, now),
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            evict: list[tuple[str]] = []
+            for key, entry_size in conn.execute("SELECT key, size FROM responses ORDER BY last_access, rowid"):
+                if total <= self.max_bytes:
+                    break
+                evict.append((key,))
+                total -= entry_size
+            conn.executemany("DELETE FROM responses WHERE key = ?", evict)
+            self.counters["evicted"] += len(evict)
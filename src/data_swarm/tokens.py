@@ -0,0 +1,116 @@
+"""Offline token estimation calibrated per model family."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+PIECE_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]+|\s+")
+CACHE_MAX_ENTRIES = 8192
+
+_CACHE: dict[tuple[str, str], int] = {}
+
+
+@dataclass(frozen=True)
+class TokenCalibration:
+    """Average characters per token for each kind of text piece, plus a safety margin."""
+
+    letters_per_token: float
+    symbols_per_token: float
+    digits_per_token: int = 3
+    margin: float = 1.05
+
+
+CALIBRATIONS = {
+    "o200k": TokenCalibration(letters_per_token=4.6, symbols_per_token=2.0),
+    "cl100k": TokenCalibration(letters_per_token=4.2, symbols_per_token=1.8),
+    "default": TokenCalibration(letters_per_token=3.8, symbols_per_token=1.5, margin=1.15),
+}
+
+MODEL_FAMILIES = (
+    ("gpt-4o", "o200k"),
+    ("gpt-4.1", "o200k"),
+    ("gpt-4.5", "o200k"),
+    ("gpt-5", "o200k"),
+    ("o1", "o200k"),
+    ("o3", "o200k"),
+    ("o4", "o200k"),
+    ("gpt-4", "cl100k"),
+    ("gpt-3.5", "cl100k"),
+)
+
+
+def model_family(model: str) -> str:
+    """Return the tokenizer family for ``model`` (longest known prefix wins)."""
+    name = model.lower().rsplit("/", 1)[-1]
+    for prefix, family in sorted(MODEL_FAMILIES, key=lambda p: len(p[0]), reverse=True):
+        if name.startswith(prefix):
+            return family
+    return "default"
+
+
+class TokenEstimator:
+    """Estimate token counts without a tokenizer download or network access.
+
+    Text is split the way BPE pre-tokenizers do (letter runs, digit runs,
+    symbol runs, whitespace) and each piece is costed with the family's
+    calibration. A single space is free because BPE merges it into the next
+    word. Counts are cached per content hash.
+    """
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+        self.family = model_family(model)
+        self.calibration = CALIBRATIONS[self.family]
+
+    def _estimate(self, text: str) -> int:
+        cal = self.calibration
+        tokens = 0
+        for piece in PIECE_RE.findall(text):
+            head = piece[0]
+            if head.isalpha():
+                tokens += math.ceil(len(piece) / cal.letters_per_token)
+            elif head.isdigit():
+                tokens += math.ceil(len(piece) / cal.digits_per_token)
+            elif head.isspace():
+                tokens += 0 if piece == " " else piece.count("\n") or 1
+            else:
+                tokens += math.ceil(len(piece) / cal.symbols_per_token)
+        return math.ceil(tokens * cal.margin)
+
+    def count(self, text: str) -> int:
+        """Return the estimated token count of ``text``."""
+        return self.count_digest(hashlib.sha256(text.encode("utf-8")).hexdigest(), text)
+
+    def count_digest(self, digest: str, text: str) -> int:
+        """Return the estimate for ``text`` whose sha256 is ``digest``, reusing the cache."""
+        key = (self.family, digest)
+        cached = _CACHE.get(key)
+        if cached is not None:
+            return cached
+        if len(_CACHE) >= CACHE_MAX_ENTRIES:
+            _CACHE.clear()
+        _CACHE[key] = value = self._estimate(text)
+        return value
+
+    def count_file(self, path: Path) -> int:
+        """Return the estimated token count of a UTF-8 file."""
+        data = path.read_bytes()
+        return self.count_digest(hashlib.sha256(data).hexdigest(), data.decode("utf-8"))
+
+    def truncate(self, text: str, max_tokens: int, marker: str = "\n... [truncated to fit token budget]\n") -> str:
+        """Return the longest line-prefix of ``text`` that, with ``marker``, fits ``max_tokens``."""
+        if self.count(text) <= max_tokens:
+            return text
+        lines = text.splitlines(keepends=True)
+        lo, hi = 0, len(lines)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.count("".join(lines[:mid]) + marker) <= max_tokens:
+                lo = mid
+            else:
+                hi = mid - 1
+        return "".join(lines[:lo]) + marker if self.count(marker) <= max_tokens else ""
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from data_swarm.llm import AsyncOpenAIProvider, LLMTimeoutError, SyncFacade
+
+
+class SleepyProvider(AsyncOpenAIProvider):
+    def __init__(self) -> None:
+        super().__init__("gpt-4o-mini")
+        self.active = 0
+        self.peak = 0
+        self.cancelled = 0
+
+    async def complete(self, prompt: str) -> str:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(float(prompt))
+            return f"done {prompt}"
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+
+
+def test_complete_many_bounds_concurrency_and_keeps_order() -> None:
+    provider = SleepyProvider()
+    results = SyncFacade(provider).complete_many(["0.03", "0.01", "0.02", "0.01", "0.0"], max_concurrency=2)
+    assert results == ["done 0.03", "done 0.01", "done 0.02", "done 0.01", "done 0.0"]
+    assert provider.peak == 2
+
+
+def test_timeouts_cancel_pending_calls() -> None:
+    provider = SleepyProvider()
+    facade = SyncFacade(provider)
+    results = facade.complete_many(["5", "0.0"], timeout=0.05, return_exceptions=True)
+    assert isinstance(results[0], LLMTimeoutError) and results[1] == "done 0.0"
+    with pytest.raises(LLMTimeoutError):
+        facade.complete_many(["5", "0.01", "5"], max_concurrency=2, timeout=0.05)
+    assert provider.cancelled >= 2
+    assert facade.complete("0.0") == "done 0.0"
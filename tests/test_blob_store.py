@@ -0,0 +1,74 @@
+import json
+import shutil
+from pathlib import Path
+
+from data_swarm.projects.meridian_aux.tools.indexer import build_index
+from data_swarm.projects.meridian_aux.tools.retriever import collect_snippets, file_digests
+from data_swarm.stores.blob_store import BlobStore
+
+
+def test_tasks_share_hardlinked_blobs_and_gc_drops_unreferenced(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    (repo / "a.py").write_text("A = 1\n", encoding="utf-8")
+    store = BlobStore(tmp_path / "home")
+    files = [("meridian", "a.py")]
+
+    first, _, _ = collect_snippets({"meridian": repo}, files, tmp_path / "t1", 1000, store=store)
+    second, _, _ = collect_snippets({"meridian": repo}, files, tmp_path / "t2", 1000, store=store)
+    assert first[0].read_text(encoding="utf-8") == "A = 1\n"
+    assert first[0].stat().st_ino == second[0].stat().st_ino
+    manifest = json.loads((tmp_path / "t1" / "manifest.json").read_text(encoding="utf-8"))
+    blob = manifest["00_meridian__a.py"]["blob"]
+    assert manifest["00_meridian__a.py"]["mode"] == "full"
+
+    shutil.rmtree(tmp_path / "t1")
+    assert store.gc()["blobs_removed"] == 0
+    shutil.rmtree(tmp_path / "t2")
+    stats = store.gc()
+    assert stats["refs_dropped"] == 1 and stats["blobs_removed"] == 1
+    assert not store.path(blob).exists()
+
+
+def test_extracts_are_cached_by_source_digest_and_mode(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path)
+    blob = store.put("def f(): ...\n", "src-sha", "skeleton")
+    assert store.lookup("src-sha", "skeleton") == blob
+    assert store.lookup("src-sha", "full") is None
+    assert store.put("def f(): ...\n") == blob
+
+
+def test_edits_after_indexing_are_not_served_from_stale_digest(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    src = repo / "a.py"
+    src.write_text("A = 1\n", encoding="utf-8")
+    idx = tmp_path / "index.sqlite"
+    build_index(idx, [repo])
+    store = BlobStore(tmp_path / "home")
+    files = [("meridian", "a.py")]
+    digests = file_digests(idx, files)
+
+    first, _, _ = collect_snippets({"meridian": repo}, files, tmp_path / "t1", 1000, store=store, digests=digests)
+    assert first[0].read_text(encoding="utf-8") == "A = 1\n"
+    src.write_text("A = 22\n", encoding="utf-8")
+    second, _, _ = collect_snippets({"meridian": repo}, files, tmp_path / "t2", 1000, store=store, digests=digests)
+    assert second[0].read_text(encoding="utf-8") == "A = 22\n"
+    assert store.read(store.lookup(digests[files[0]][0], "full") or "") == "A = 1\n"
+
+
+def test_rewriting_a_linked_snippet_without_store_keeps_blob_intact(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    (repo / "a.py").write_text("A = 1\n", encoding="utf-8")
+    store = BlobStore(tmp_path / "home")
+    files = [("meridian", "a.py")]
+    linked, _, _ = collect_snippets({"meridian": repo}, files, tmp_path / "t1", 1000, store=store)
+    blob = json.loads((tmp_path / "t1" / "manifest.json").read_text(encoding="utf-8"))["00_meridian__a.py"]["blob"]
+
+    (repo / "a.py").write_text("A = 22\n", encoding="utf-8")
+    plain, _, _ = collect_snippets({"meridian": repo}, files, tmp_path / "t1", 1000)
+    assert plain[0].read_text(encoding="utf-8") == "A = 22\n"
+    assert store.read(blob) == "A = 1\n"
+    stats = store.gc()
+    assert stats["refs_dropped"] == 1 and stats["blobs_removed"] == 1
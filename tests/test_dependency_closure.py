@@ -1,3 +1,4 @@
+import sqlite3
 from pathlib import Path
 
 from data_swarm.projects.meridian_aux.tools.dependency_closure import dependency_closure
@@ -20,3 +21,80 @@ def test_dependency_closure_follows_imports(tmp_path: Path) -> None:
     files, _ = dependency_closure(idx, [("meridian_aux", "main.py")], max_files=5)
     assert ("meridian_aux", "main.py") in files
     assert ("meridian_aux", "util.py") in files
+
+
+def test_edges_are_resolved_at_build_time_and_refreshed_incrementally(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian_aux"
+    (repo / "pkg").mkdir(parents=True)
+    (repo / "pkg" / "__init__.py").write_text("", encoding="utf-8")
+    (repo / "pkg" / "core.py").write_text("from . import helpers\n", encoding="utf-8")
+    idx = tmp_path / "index.sqlite"
+    build_index(idx, [repo])
+
+    with sqlite3.connect(idx) as conn:
+        rows = conn.execute("SELECT dst_file FROM edges WHERE src_file = 'pkg/core.py'").fetchall()
+        assert ("pkg/__init__.py",) in rows
+        assert ("pkg/helpers.py",) not in rows
+
+    (repo / "pkg" / "helpers.py").write_text("def h():\n    return 1\n", encoding="utf-8")
+    build_index(idx, [repo])
+
+    files, edges = dependency_closure(idx, [("meridian_aux", "pkg/core.py")], max_files=5)
+    assert ("meridian_aux", "pkg/helpers.py") in files
+    assert {"from": "meridian_aux/pkg/core.py", "to": "meridian_aux/pkg/helpers.py", "import": "."} in edges
+
+
+def test_closure_follows_imports_into_other_repo_by_precedence(tmp_path: Path) -> None:
+    meridian = tmp_path / "meridian"
+    meridian_aux = tmp_path / "meridian_aux"
+    (meridian / "meridian" / "model").mkdir(parents=True)
+    (meridian / "meridian" / "__init__.py").write_text("", encoding="utf-8")
+    (meridian / "meridian" / "model" / "__init__.py").write_text("", encoding="utf-8")
+    (meridian / "meridian" / "model" / "spec.py").write_text("class ModelSpec:\n    pass\n", encoding="utf-8")
+    (meridian_aux / "meridian" / "model").mkdir(parents=True)
+    (meridian_aux / "meridian" / "model" / "spec.py").write_text("class Vendored:\n    pass\n", encoding="utf-8")
+    (meridian_aux / "runner.py").write_text("import meridian.model.spec\n", encoding="utf-8")
+    idx = tmp_path / "index.sqlite"
+
+    build_index(idx, [meridian, meridian_aux])
+    files, _ = dependency_closure(idx, [("meridian_aux", "runner.py")], max_files=5)
+    assert ("meridian_aux", "meridian/model/spec.py") in files
+
+    build_index(idx, [meridian, meridian_aux], repo_precedence=["meridian", "meridian_aux"])
+    files, edges = dependency_closure(idx, [("meridian_aux", "runner.py")], max_files=5)
+    assert ("meridian", "meridian/model/spec.py") in files
+    assert ("meridian_aux", "meridian/model/spec.py") not in files
+    assert edges[0]["to"] == "meridian/meridian/model/spec.py"
+
+
+def test_closure_resolves_upstream_module_missing_from_importer_repo(tmp_path: Path) -> None:
+    meridian = tmp_path / "meridian"
+    meridian_aux = tmp_path / "meridian_aux"
+    (meridian / "meridian").mkdir(parents=True)
+    meridian_aux.mkdir()
+    (meridian / "meridian" / "__init__.py").write_text("", encoding="utf-8")
+    (meridian / "meridian" / "constants.py").write_text("X = 1\n", encoding="utf-8")
+    (meridian_aux / "main.py").write_text("from meridian import constants\n", encoding="utf-8")
+    idx = tmp_path / "index.sqlite"
+    build_index(idx, [meridian, meridian_aux])
+
+    files, _ = dependency_closure(idx, [("meridian_aux", "main.py")], max_files=5)
+    assert ("meridian", "meridian/constants.py") in files
+
+
+def test_from_import_resolves_named_submodule_or_package_init_only(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian"
+    (repo / "pkg").mkdir(parents=True)
+    (repo / "pkg" / "__init__.py").write_text("VALUE = 1\n", encoding="utf-8")
+    for name in ["alpha", "beta", "gamma", "delta"]:
+        (repo / "pkg" / f"{name}.py").write_text("X = 1\n", encoding="utf-8")
+    (repo / "uses_module.py").write_text("from pkg import beta\n", encoding="utf-8")
+    (repo / "uses_name.py").write_text("from pkg import VALUE\n", encoding="utf-8")
+    idx = tmp_path / "index.sqlite"
+    build_index(idx, [repo])
+
+    files, _ = dependency_closure(idx, [("meridian", "uses_module.py")], max_files=10)
+    assert files == [("meridian", "uses_module.py"), ("meridian", "pkg/beta.py")]
+
+    files, _ = dependency_closure(idx, [("meridian", "uses_name.py")], max_files=10)
+    assert files == [("meridian", "uses_name.py"), ("meridian", "pkg/__init__.py")]
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from data_swarm.projects.meridian_aux.tools.packing import PackItem, pack
+from data_swarm.projects.meridian_aux.tools.retriever import collect_snippets
+
+
+def test_pack_skips_oversized_item_and_keeps_smaller_later_ones() -> None:
+    items = [
+        PackItem(("r", "a.py"), 1.0, 40),
+        PackItem(("r", "big.py"), 0.9, 100),
+        PackItem(("r", "b.py"), 0.5, 30),
+        PackItem(("r", "c.py"), 0.4, 30),
+    ]
+    decisions = pack(items, budget=100)
+    assert [d.included for d in decisions] == [True, False, True, True]
+    assert "remaining" in decisions[1].reason
+
+
+def test_exact_pass_beats_greedy_density_for_small_n() -> None:
+    items = [PackItem(("r", "dense.py"), 6.0, 51), PackItem(("r", "x.py"), 5.0, 50), PackItem(("r", "y.py"), 5.0, 50)]
+    decisions = pack(items, budget=100)
+    assert [d.included for d in decisions] == [False, True, True]
+    assert decisions[1].reason.startswith("included (exact")
+    assert [d.included for d in pack(items, budget=100, exact_max_items=0)] == [True, False, False]
+
+
+def test_collect_snippets_packs_past_a_file_that_does_not_fit(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    (repo / "a.py").write_text("a" * 40, encoding="utf-8")
+    (repo / "big.py").write_text("b" * 500, encoding="utf-8")
+    (repo / "c.py").write_text("c" * 40, encoding="utf-8")
+    report = tmp_path / "packing_report.md"
+    files = [("meridian", "a.py"), ("meridian", "big.py"), ("meridian", "c.py")]
+
+    used, chars, _ = collect_snippets({"meridian": repo}, files, tmp_path / "out", 100, report_path=report)
+
+    assert [p.name for p in used] == ["00_meridian__a.py", "02_meridian__c.py"]
+    assert chars == 80
+    text = report.read_text(encoding="utf-8")
+    assert "meridian/big.py" in text.split("## Excluded")[1]
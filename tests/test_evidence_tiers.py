@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from data_swarm.projects.meridian_aux.tools.dependency_closure import closure_distances
+from data_swarm.projects.meridian_aux.tools.indexer import build_index
+from data_swarm.projects.meridian_aux.tools.retriever import assign_tiers, collect_snippets
+from data_swarm.projects.meridian_aux.tools.skeleton import render_skeleton
+
+SOURCE = '''"""Adstock helpers.
+
+Longer description that the skeleton drops.
+"""
+
+import numpy as np
+
+DECAY: float = 0.5
+
+
+class Adstock:
+    """Geometric adstock transform."""
+
+    rate: float
+
+    def apply(self, x: np.ndarray, lag: int = 3) -> np.ndarray:
+        """Apply the transform."""
+        out = x.copy()
+        return out * self.rate
+'''
+
+
+def test_render_skeleton_keeps_signatures_and_drops_bodies() -> None:
+    text = render_skeleton(SOURCE)
+    assert text.startswith('"""Adstock helpers."""')
+    assert "import numpy as np" in text and "DECAY: float = 0.5" in text
+    assert "def apply(self, x: np.ndarray, lag: int=3) -> np.ndarray:" in text
+    assert '"""Apply the transform."""' in text and "rate: float" in text
+    assert "x.copy()" not in text and "Longer description" not in text
+    assert render_skeleton("def broken(:\n") == "def broken(:\n"
+
+
+def test_distances_drive_tiers(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    (repo / "a.py").write_text("import b\n", encoding="utf-8")
+    (repo / "b.py").write_text("import c\n", encoding="utf-8")
+    (repo / "c.py").write_text(SOURCE, encoding="utf-8")
+    idx = tmp_path / "index.sqlite"
+    build_index(idx, [repo])
+    files = [("meridian", "a.py"), ("meridian", "b.py"), ("meridian", "c.py")]
+
+    distances = closure_distances(idx, [files[0]])
+    assert distances == {files[0]: 0, files[1]: 1, files[2]: 2}
+    tiers = assign_tiers(distances, files)
+    assert tiers == {files[0]: "full", files[1]: "full", files[2]: "skeleton"}
+
+    snippets, _, sources = collect_snippets({"meridian": repo}, files, tmp_path / "out", 10_000, tiers=tiers)
+    assert snippets[2].read_text(encoding="utf-8") == render_skeleton(SOURCE)
+    assert [tiers[sources[p]] for p in snippets] == ["full", "full", "skeleton"]
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from data_swarm.projects.meridian_aux.tools.dependency_closure import reverse_dependencies
+from data_swarm.projects.meridian_aux.tools.import_graph import ImportGraph, load_graph
+from data_swarm.projects.meridian_aux.tools.indexer import build_index
+
+
+def test_csr_closure_and_reverse_edges() -> None:
+    a, b, c, d = ("r", "a.py"), ("r", "b.py"), ("r", "c.py"), ("r", "d.py")
+    graph = ImportGraph([a, b, c, d], [(a, b, "b"), (b, c, "c"), (a, c, "c"), (d, a, "a")])
+
+    files, edges = graph.closure([a], max_files=10)
+    assert files == [a, b, c]
+    assert [e["to"] for e in edges] == ["r/b.py", "r/c.py", "r/c.py"]
+    assert list(graph.successors(graph.ids[a])) == [graph.ids[b], graph.ids[c]]
+    assert graph.dependents([c]) == [b, a, d]
+    assert graph.closure([a], max_files=2)[0] == [a, b]
+
+
+def test_graph_cache_follows_index_version(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    (repo / "base.py").write_text("X = 1\n", encoding="utf-8")
+    (repo / "user.py").write_text("import base\n", encoding="utf-8")
+    idx = tmp_path / "index.sqlite"
+    build_index(idx, [repo])
+
+    first = load_graph(idx)
+    assert load_graph(idx) is first
+    assert reverse_dependencies(idx, [("meridian", "base.py")]) == [("meridian", "user.py")]
+
+    (repo / "other.py").write_text("import base\n", encoding="utf-8")
+    build_index(idx, [repo])
+    assert load_graph(idx) is not first
+    assert set(reverse_dependencies(idx, [("meridian", "base.py")])) == {
+        ("meridian", "user.py"),
+        ("meridian", "other.py"),
+    }
+
+
+def test_ranked_closure_prefers_files_close_to_high_scoring_seeds() -> None:
+    entry, other = ("r", "entry.py"), ("r", "other.py")
+    near, far, side = ("r", "near.py"), ("r", "far.py"), ("r", "side.py")
+    graph = ImportGraph(
+        [entry, other, near, far, side],
+        [(entry, near, "near"), (near, far, "far"), (other, side, "side")],
+    )
+
+    files, edges, scores = graph.ranked_closure({entry: 0.9, other: 0.1}, max_files=3)
+    assert files == [entry, near, far]
+    assert scores[entry] > scores[near] > scores[far]
+    assert {e["to"] for e in edges} == {"r/near.py", "r/far.py"}
+
+    files, _, _ = graph.ranked_closure({entry: 0.5, other: 0.5}, max_files=4)
+    assert set(files[:2]) == {entry, other}
@@ -0,0 +1,55 @@
+import sqlite3
+from pathlib import Path
+
+from data_swarm.projects.meridian_aux.tools.indexer import build_index
+
+
+def _symbols(idx: Path) -> set[tuple[str, str]]:
+    with sqlite3.connect(idx) as conn:
+        return set(conn.execute("SELECT file_path, symbol FROM symbols").fetchall())
+
+
+def test_incremental_build_reparses_only_changed_files(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian_aux"
+    repo.mkdir()
+    (repo / "a.py").write_text("def a():\n    return 1\n", encoding="utf-8")
+    (repo / "b.py").write_text("def b():\n    return 2\n", encoding="utf-8")
+    idx = tmp_path / "index.sqlite"
+
+    assert build_index(idx, [repo]) == {"added": 2, "changed": 0, "removed": 0, "unchanged": 0}
+    assert build_index(idx, [repo]) == {"added": 0, "changed": 0, "removed": 0, "unchanged": 2}
+
+    (repo / "a.py").write_text("def a_renamed():\n    return 10\n", encoding="utf-8")
+    (repo / "b.py").unlink()
+    (repo / "c.py").write_text("class C:\n    pass\n", encoding="utf-8")
+    stats = build_index(idx, [repo])
+
+    assert stats == {"added": 1, "changed": 1, "removed": 1, "unchanged": 0}
+    assert _symbols(idx) == {("a.py", "a_renamed"), ("c.py", "C")}
+    with sqlite3.connect(idx) as conn:
+        assert {r[0] for r in conn.execute("SELECT file_path FROM files")} == {"a.py", "c.py"}
+
+
+def test_full_build_rebuilds_everything(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    (repo / "a.py").write_text("def a():\n    return 1\n", encoding="utf-8")
+    idx = tmp_path / "index.sqlite"
+    build_index(idx, [repo])
+
+    assert build_index(idx, [repo], full=True)["added"] == 1
+    assert _symbols(idx) == {("a.py", "a")}
+
+
+def test_parallel_build_matches_serial_build(tmp_path: Path, monkeypatch) -> None:
+    repo = tmp_path / "meridian"
+    (repo / "pkg").mkdir(parents=True)
+    for i in range(6):
+        (repo / "pkg" / f"m{i}.py").write_text(f"import os\n\ndef f{i}():\n    return {i}\n", encoding="utf-8")
+    serial_idx = tmp_path / "serial.sqlite"
+    parallel_idx = tmp_path / "parallel.sqlite"
+    build_index(serial_idx, [repo], jobs=1)
+
+    monkeypatch.setattr("data_swarm.projects.meridian_aux.tools.indexer.PARALLEL_MIN_FILES", 1)
+    assert build_index(parallel_idx, [repo], jobs=2)["added"] == 6
+    assert _symbols(parallel_idx) == _symbols(serial_idx)
@@ -0,0 +1,46 @@
+import logging
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from data_swarm.projects.meridian_aux.tools.indexer import build_index
+
+
+def test_bulk_build_creates_deferred_indexes_and_logs_phases(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    for i in range(5):
+        (repo / f"m{i}.py").write_text(
+            f"import os\n\nclass C{i}:\n    def run(self):\n        return {i}\n", encoding="utf-8"
+        )
+    idx = tmp_path / "index.sqlite"
+
+    with caplog.at_level(logging.INFO, logger="data_swarm.projects.meridian_aux.tools.indexer"):
+        build_index(idx, [repo], batch_size=3)
+
+    with sqlite3.connect(idx) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM symbols").fetchone()[0] == 10
+        assert conn.execute("SELECT COUNT(*) FROM imports").fetchone()[0] == 5
+        names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_symbols_file", "idx_modules_file", "idx_imports_file"} <= names
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    message = caplog.records[-1].getMessage()
+    for phase in ("discover=", "parse=", "insert=", "index="):
+        assert phase in message
+
+
+def test_failed_build_rolls_back(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    (repo / "ok.py").write_text("def ok():\n    return 1\n", encoding="utf-8")
+    idx = tmp_path / "index.sqlite"
+    build_index(idx, [repo])
+
+    (repo / "new.py").write_text("def new():\n    return 2\n", encoding="utf-8")
+    (repo / "broken.py").write_text("def broken(:\n", encoding="utf-8")
+    with pytest.raises(SyntaxError):
+        build_index(idx, [repo], batch_size=1)
+
+    with sqlite3.connect(idx) as conn:
+        assert {r[0] for r in conn.execute("SELECT file_path FROM files")} == {"ok.py"}
@@ -0,0 +1,73 @@
+import copy
+from pathlib import Path
+
+import pytest
+
+from data_swarm.config import DEFAULT_CONFIG
+from data_swarm.llm import CachedProvider
+from data_swarm.orchestrator.task_models import Task
+from data_swarm.projects.meridian_aux.project import MeridianAuxProject
+from data_swarm.stores import llm_cache
+from data_swarm.stores.llm_cache import LLMCache
+from data_swarm.tools.io import FakeIO
+
+
+class CountingProvider:
+    model = "gpt-4o-mini"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def complete(self, prompt: str) -> str:
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+def test_cached_provider_hits_on_normalized_prompt(tmp_path: Path) -> None:
+    inner = CountingProvider()
+    seen: list[str] = []
+    provider = CachedProvider(inner, LLMCache(tmp_path / "llm.sqlite"), lambda outcome, _: seen.append(outcome))
+
+    assert provider.complete("fix the bug\r\n") == "answer 1"
+    assert provider.complete("fix the bug   ") == "answer 1"
+    assert inner.calls == 1 and seen == ["miss", "hit"]
+
+    provider.cache.bypass = True
+    assert provider.complete("fix the bug") == "answer 2"
+    assert provider.cache.counters == {"hits": 1, "misses": 1, "bypassed": 1, "evicted": 0}
+
+
+def test_ttl_expiry_and_lru_eviction(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    cache = LLMCache(tmp_path / "llm.sqlite", ttl_seconds=60, max_bytes=10)
+    cache.put("m", "a", "12345")
+    now[0] += 1
+    cache.put("m", "b", "12345")
+    now[0] += 1
+    assert cache.get("m", "a") == "12345"
+    now[0] += 1
+    cache.put("m", "c", "12345")
+    assert cache.get("m", "b") is None and cache.get("m", "a") == "12345"
+    now[0] += 120
+    assert cache.get("m", "c") is None
+    assert cache.counters["evicted"] == 1
+
+
+def test_call_params_are_part_of_the_key(tmp_path: Path) -> None:
+    inner = CountingProvider()
+    cache = LLMCache(tmp_path / "llm.sqlite")
+    assert CachedProvider(inner, cache, params={"timeout_seconds": 60}).complete("p") == "answer 1"
+    assert CachedProvider(inner, cache, params={"timeout_seconds": 60}).complete("p") == "answer 1"
+    assert CachedProvider(inner, cache, params={"timeout_seconds": 120}).complete("p") == "answer 2"
+
+
+def test_cache_is_off_by_default_and_never_wraps_uncached_roles(tmp_path: Path) -> None:
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config["data_swarm_home"] = str(tmp_path)
+    project = MeridianAuxProject(config, FakeIO())
+    task = Task(task_id="t1", title="t", description="d")
+    assert not isinstance(project._provider(task, tmp_path, "gpt-4o-mini", 60), CachedProvider)
+    config["llm"]["cache"]["enabled"] = True
+    assert isinstance(project._provider(task, tmp_path, "gpt-4o-mini", 60), CachedProvider)
+    assert not isinstance(project._provider(task, tmp_path, "gpt-4o-mini", 60, cached=False), CachedProvider)
@@ -0,0 +1,91 @@
+import copy
+import json
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from data_swarm.config import DEFAULT_CONFIG
+from data_swarm.llm import LLMUnavailableError
+from data_swarm.llm_modes import (
+    FakeLLMServer,
+    RecordingProvider,
+    ReplayProvider,
+    cassette_path,
+    fake_response,
+    provider_for_mode,
+)
+from data_swarm.orchestrator.task_models import Task
+from data_swarm.projects.meridian_aux.project import MeridianAuxProject
+from data_swarm.tools.io import FakeIO
+
+
+class EchoProvider:
+    model = "gpt-4o-mini"
+
+    def complete(self, prompt: str) -> str:
+        return prompt.upper()
+
+    def stream(self, prompt: str):
+        yield from prompt.upper()
+
+
+def test_record_then_replay_serves_cassette(tmp_path: Path) -> None:
+    path = cassette_path(tmp_path, "bench")
+    assert path == tmp_path / "cassettes" / "bench.jsonl"
+    recorder = RecordingProvider(EchoProvider(), path)
+    assert recorder.complete("fix it") == "FIX IT"
+    assert "".join(recorder.stream("stream it")) == "STREAM IT"
+    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert rows[1]["first_token_seconds"] is not None and "prompt" not in rows[0]
+
+    replay = ReplayProvider(path, "gpt-4o-mini")
+    assert replay.complete("fix it  ") == "FIX IT"
+    assert "".join(replay.stream("stream it")) == "STREAM IT"
+    with pytest.raises(LLMUnavailableError):
+        replay.complete("never recorded")
+    with pytest.raises(LLMUnavailableError):
+        ReplayProvider(tmp_path / "missing.jsonl", "gpt-4o-mini").complete("x")
+
+
+def test_mode_selection(tmp_path: Path) -> None:
+    live = EchoProvider()
+    assert provider_for_mode(live, {"mode": "live"}, tmp_path) is live
+    assert isinstance(provider_for_mode(live, {"mode": "record", "cassette": "a"}, tmp_path), RecordingProvider)
+    assert isinstance(provider_for_mode(live, {"mode": "replay", "cassette": "a"}, tmp_path), ReplayProvider)
+    with pytest.raises(ValueError):
+        provider_for_mode(live, {"mode": "replay"}, tmp_path)
+    with pytest.raises(ValueError):
+        provider_for_mode(live, {"mode": "bogus"}, tmp_path)
+
+
+def test_fake_server_is_deterministic() -> None:
+    server = FakeLLMServer()
+    try:
+        def post(payload: dict) -> bytes:
+            req = urllib.request.Request(
+                server.base_url + "/responses",
+                data=json.dumps(payload).encode(),
+                headers={"content-type": "application/json"},
+            )
+            return urllib.request.urlopen(req).read()
+
+        body = json.loads(post({"model": "gpt-4o-mini", "input": "hello"}))
+        assert body["output"][0]["content"][0]["text"] == fake_response("gpt-4o-mini", "hello")
+        assert body == json.loads(post({"model": "gpt-4o-mini", "input": "hello"}))
+        events = post({"model": "gpt-4o-mini", "input": "hello", "stream": True}).decode()
+        deltas = [
+            json.loads(line[6:])["delta"] for line in events.splitlines() if '"response.output_text.delta"' in line
+        ]
+        assert "".join(deltas) == fake_response("gpt-4o-mini", "hello")
+    finally:
+        server.close()
+
+
+def test_record_mode_bypasses_response_cache(tmp_path: Path) -> None:
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config["data_swarm_home"] = str(tmp_path)
+    config["llm"].update({"mode": "record", "cassette": "run"})
+    config["llm"]["cache"]["enabled"] = True
+    provider = MeridianAuxProject(config, FakeIO())._provider(Task("t1", "t", "d"), tmp_path, "gpt-4o-mini", 60)
+    assert isinstance(provider, RecordingProvider)
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from data_swarm import llm
+from data_swarm.llm import ClientSettings, get_provider, reset_registry
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeAsyncClient(FakeClient):
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+def test_providers_and_clients_are_reused(monkeypatch: pytest.MonkeyPatch) -> None:
+    built: list[tuple[str, ClientSettings]] = []
+
+    def build(key: str, settings: ClientSettings) -> FakeClient:
+        built.append((key, settings))
+        return FakeClient()
+
+    monkeypatch.setattr(llm, "_build_client", build)
+    reset_registry()
+    settings = ClientSettings.from_config({"timeout_seconds": 5, "max_connections": 4})
+    assert settings.timeout_seconds == 5.0 and settings.max_connections == 4 and settings.max_retries == 0
+
+    assert get_provider("gpt-4o-mini", settings) is get_provider("gpt-4o-mini", settings)
+    assert get_provider("gpt-4o", settings) is not get_provider("gpt-4o-mini", settings)
+    client = get_provider("gpt-4o", settings)._client("k1")
+    assert get_provider("gpt-4o-mini", settings)._client("k1") is client
+    get_provider("gpt-4o-mini", settings)._client("k2")
+    assert len(built) == 2
+
+    reset_registry()
+    assert client.closed
+
+
+def test_async_clients_are_closed_with_their_loop_or_on_reset(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(llm, "_build_async_client", lambda key, settings: FakeAsyncClient())
+    reset_registry()
+    settings = ClientSettings()
+
+    async def both() -> tuple[FakeAsyncClient, FakeAsyncClient]:
+        return await llm.shared_async_client("k", settings), await llm.shared_async_client("k", settings)
+
+    first, again = asyncio.run(both())
+    assert first is again and first.closed
+    assert not llm._ASYNC_CLIENTS
+
+    future = asyncio.run_coroutine_threadsafe(llm.shared_async_client("k", settings), llm._background_loop())
+    background = future.result()
+    assert not background.closed
+    reset_registry()
+    assert background.closed and not llm._ASYNC_CLIENTS
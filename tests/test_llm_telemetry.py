@@ -0,0 +1,95 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from data_swarm.llm import CachedProvider
+from data_swarm.llm_telemetry import (
+    InstrumentedProvider,
+    load_llm_calls,
+    percentile,
+    render_llm_stats,
+    summarize_llm_calls,
+)
+from data_swarm.stores.llm_cache import LLMCache
+from data_swarm.stores.log_store import LogStore
+
+
+class EchoProvider:
+    model = "gpt-4o-mini"
+    last_outcome = "hit"
+
+    def complete(self, prompt: str) -> str:
+        return "patch: ''\nnotes: ok\n"
+
+    def stream(self, prompt: str):
+        yield "patch: ''\n"
+        yield "notes: ok\n"
+
+
+class BrokenProvider(EchoProvider):
+    def complete(self, prompt: str) -> str:
+        raise TimeoutError("slow")
+
+
+def test_each_call_emits_llm_call_event_and_stats_aggregate(tmp_path: Path) -> None:
+    pricing = {"gpt-4o-mini": {"input_per_mtok": 1.0, "output_per_mtok": 2.0}}
+    for task_id in ("t1", "t2"):
+        logs = LogStore(tmp_path / "tasks" / task_id)
+
+        def emit(data: dict, task_id: str = task_id, logs: LogStore = logs) -> None:
+            logs.event(task_id, "deliverable", "llm_call", "LLM call", data)
+
+        provider = InstrumentedProvider(EchoProvider(), "codegen", emit, pricing)
+        provider.complete("write the patch")
+        assert "".join(provider.stream("write the patch")).endswith("notes: ok\n")
+    with pytest.raises(TimeoutError):
+        InstrumentedProvider(BrokenProvider(), "debugger", emit).complete("x")
+
+    calls = load_llm_calls(tmp_path)
+    assert len(calls) == 5
+    streamed = [c for c in calls if c["streamed"]]
+    assert all(c["ttft_seconds"] <= c["latency_seconds"] for c in streamed)
+    assert calls[0]["cache_hit"] is True and calls[0]["prompt_tokens"] > 0 and calls[0]["cost_usd"] > 0
+    summary = summarize_llm_calls(calls)
+    assert [(r["agent"], r["calls"], r["errors"]) for r in summary] == [("codegen", 4, 0), ("debugger", 1, 1)]
+    assert summarize_llm_calls(calls, grouped=False)[0]["calls"] == 5
+    assert "codegen" in render_llm_stats(summary)
+
+
+def test_percentile_nearest_rank() -> None:
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0 and percentile(values, 95) == 95.0 and percentile([], 95) == 0.0
+
+
+class WaitingProvider(EchoProvider):
+    def __init__(self) -> None:
+        self.release = threading.Event()
+
+    def complete(self, prompt: str) -> str:
+        if prompt == "cold":
+            assert self.release.wait(5)
+        if prompt == "broken":
+            raise TimeoutError("slow")
+        return prompt
+
+
+def test_cache_hit_is_per_call_and_none_on_errors(tmp_path: Path) -> None:
+    inner = WaitingProvider()
+    cached = CachedProvider(inner, LLMCache(tmp_path / "llm.sqlite"))
+    cached.complete("hot")
+    events: list[dict] = []
+    provider = InstrumentedProvider(cached, "debugger", events.append)
+
+    def hot() -> None:
+        provider.complete("hot")
+        inner.release.set()
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        cold = pool.submit(provider.complete, "cold")
+        pool.submit(hot).result()
+        cold.result()
+    with pytest.raises(TimeoutError):
+        provider.complete("broken")
+    assert [e["cache_hit"] for e in events] == [True, False, None]
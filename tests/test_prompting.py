@@ -0,0 +1,77 @@
+from pathlib import Path
+
+from data_swarm.config import init_home
+from data_swarm.kb import load_stage_policy
+from data_swarm.llm_telemetry import InstrumentedProvider
+from data_swarm.projects.meridian_aux.agents.codegen import CodegenAgent
+from data_swarm.projects.meridian_aux.agents.debugger import DebuggerAgent
+from data_swarm.prompting import PromptAssembler, policy_pack_hash, rendered_prefix, reset_prefix_cache
+
+POLICY = {"core_prompt": "Core rules.\r\n", "behaviour_cards": ["card a  \n"], "decision_trees": ["tree"]}
+
+
+class RecordingProvider:
+    model = "gpt-4o-mini"
+
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def complete(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return "patch: ''\nprobe_snippet: ''\nnotes: ok\n"
+
+
+def test_prefix_is_byte_stable_and_cached_per_policy_hash() -> None:
+    reset_prefix_cache()
+    first = rendered_prefix("System.\n", POLICY)
+    assert first == "System.\n\nCore rules.\n\n## Behaviour card\n\ncard a\n\n## Decision tree\n\ntree"
+    assert rendered_prefix("System.\n", dict(reversed(POLICY.items()))) is first
+    assert policy_pack_hash(POLICY) != policy_pack_hash({**POLICY, "decision_trees": []})
+
+
+def test_cached_prefix_ratio_counts_warm_prefixes_only() -> None:
+    reset_prefix_cache()
+    now = [0.0]
+    assembler = PromptAssembler("gpt-4o-mini", ttl_seconds=60, min_prefix_tokens=0, clock=lambda: now[0])
+    cold = assembler.assemble("System.", ["traceback 1"], POLICY, ["task context"])
+    warm = assembler.assemble("System.", ["traceback 2"], POLICY, ["task context"])
+    assert cold.startswith("System.") and cold.endswith("task context\n\ntraceback 1")
+    assert cold.prefix_hash == warm.prefix_hash and cold.cached_prefix_ratio == 0.0
+    assert 0 < warm.cached_prefix_ratio < 1 and warm.cached_prefix_tokens == warm.prefix_tokens
+    now[0] = 120.0
+    assert assembler.assemble("System.", ["traceback 3"], POLICY, ["task context"]).cached_prefix_ratio == 0.0
+    short = PromptAssembler("gpt-4o-mini", clock=lambda: now[0])
+    assert short.assemble("System.", ["traceback 4"], POLICY, ["task context"]).cached_prefix_ratio == 0.0
+
+
+def test_debug_iterations_share_prefix_and_report_ratio(tmp_path: Path) -> None:
+    reset_prefix_cache()
+    prompt_path = tmp_path / "debugger.md"
+    prompt_path.write_text("Return YAML.", encoding="utf-8")
+    events: list[dict] = []
+    inner = RecordingProvider()
+    agent = DebuggerAgent("gpt-4o-mini", provider=InstrumentedProvider(inner, "debugger", events.append), policy=POLICY)
+    agent.assembler.min_prefix_tokens = 0
+    for n in (1, 2):
+        assert agent.propose(prompt_path, f"Traceback {n}", task_context="# Context Summary")["notes"] == "ok"
+    first, second = inner.prompts
+    assert first.split("Traceback")[0] == second.split("Traceback")[0]
+    assert [e["cached_prefix_ratio"] for e in events][0] == 0.0 and events[1]["cached_prefix_ratio"] > 0
+    assert events[0]["prefix_hash"] == events[1]["prefix_hash"]
+
+
+def test_init_home_seeds_meridian_aux_policy_into_codegen_prefix(tmp_path: Path) -> None:
+    reset_prefix_cache()
+    repo_root = tmp_path / "data_swarm"
+    for name in ("data_swarm", "meridian", "meridian_aux", ".data_swarm"):
+        (tmp_path / name).mkdir()
+    home = tmp_path / ".data_swarm"
+    (home / "config.yaml").write_text(f'{{"paths": {{"repo_root": "{repo_root.as_posix()}"}}}}', encoding="utf-8")
+    init_home(home=home)
+    policy = load_stage_policy(home, "meridian_aux")
+    assert "read-only" in policy["core_prompt"]
+    prompt_path = tmp_path / "codegen.md"
+    prompt_path.write_text("Return YAML.", encoding="utf-8")
+    prompt = CodegenAgent("gpt-4o-mini", provider=RecordingProvider(), policy=policy).assemble(prompt_path, "# Task")
+    assert prompt.startswith("Return YAML.\n\n# Meridian_Aux Policy Core") and prompt.endswith("# Task")
+    assert "read-only" in prompt[: len(prompt) - len("# Task")]
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+from data_swarm.projects.meridian_aux.agents.navigator import NavigatorAgent
+from data_swarm.projects.meridian_aux.tools.indexer import build_index
+from data_swarm.projects.meridian_aux.tools.query_planner import extract_terms, plan_query
+
+
+def _repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    (repo / "adstock.py").write_text(
+        "class GeometricAdstock:\n    def apply(self):\n        return 1\n",
+        encoding="utf-8",
+    )
+    (repo / "priors.py").write_text(
+        'def build_prior():\n    """Create the default prior distribution."""\n',
+        encoding="utf-8",
+    )
+    (repo / "common.py").write_text(
+        "".join(f"def apply_{i}():\n    return {i}\n" for i in range(6)),
+        encoding="utf-8",
+    )
+    return repo
+
+
+def test_extract_terms_drops_stopwords_and_splits_identifiers() -> None:
+    terms = [t for t, _ in extract_terms("Please fix the GeometricAdstock decay so it uses the prior")]
+    assert "the" not in terms and "please" not in terms
+    assert terms[:3] == ["fix", "GeometricAdstock", "geometric"]
+    assert "adstock" in terms and "prior" in terms
+
+
+def test_plan_weights_rare_terms_higher(tmp_path: Path) -> None:
+    idx = tmp_path / "index.sqlite"
+    build_index(idx, [_repo(tmp_path)])
+
+    plan = plan_query(idx, "apply the geometric adstock, unknownword")
+    weights = {t.text: t.weight for t in plan.terms}
+    assert "unknownword" not in weights
+    assert weights["adstock"] > weights["apply"]
+
+
+def test_navigator_fuses_multi_sentence_descriptions(tmp_path: Path) -> None:
+    idx = tmp_path / "index.sqlite"
+    build_index(idx, [_repo(tmp_path)])
+
+    nav = NavigatorAgent().decide(
+        idx,
+        "The geometric adstock transform returns wrong values. Check how the prior is built as well.",
+    )
+    files = [h["file_path"] for h in nav["entrypoints"]]
+    assert files[0] == "adstock.py"
+    assert "priors.py" in files
+    assert len(files) == len(set(files))
+
+
+def test_long_descriptions_stay_under_sqlite_compound_select_limit(tmp_path: Path) -> None:
+    idx = tmp_path / "index.sqlite"
+    build_index(idx, [_repo(tmp_path)])
+    words = " ".join(f"word{i:04d}x" for i in range(600))
+    plan = plan_query(idx, f"{words} geometric adstock")
+    assert [t.text for t in plan.terms][:2] in (["geometric", "adstock"], ["adstock", "geometric"])
+    assert NavigatorAgent().decide(idx, f"{words} adstock")["entrypoints"]
@@ -0,0 +1,115 @@
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from data_swarm import llm
+from data_swarm.llm import LLMTransientError, OpenAIProvider, reset_registry
+from data_swarm.rate_limit import CallPolicy, RateLimiter, backoff_delay, call_with_retry
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    failures = 2
+    calls = 0
+
+    def do_GET(self) -> None:  # noqa: N802
+        type(self).calls += 1
+        if type(self).calls <= type(self).failures:
+            self.send_response(429)
+            self.send_header("Retry-After", "0.25")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def test_retry_honors_retry_after_from_local_fake_server() -> None:
+    server = HTTPServer(("127.0.0.1", 0), FakeLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    slept: list[float] = []
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/"
+        body = call_with_retry(
+            lambda: urllib.request.urlopen(url).read(), CallPolicy(base_delay_seconds=0.01), slept.append
+        )
+    finally:
+        server.shutdown()
+    assert body == b"ok" and FakeLLMHandler.calls == 3
+    assert slept == [0.25, 0.25]
+
+
+def test_token_buckets_space_requests_and_tokens() -> None:
+    now = [0.0]
+    limiter = RateLimiter(rpm=60, tpm=600, clock=lambda: now[0])
+    assert limiter.reserve(100) == 0.0
+    assert limiter.reserve(500) == 0.0
+    assert limiter.reserve(100) == pytest.approx(10.0)
+    now[0] += 10
+    limiter.settle(50)
+    assert limiter.reserve(0) == pytest.approx(5.0)
+    assert 0 <= backoff_delay(3, CallPolicy(base_delay_seconds=1, max_delay_seconds=4)) <= 4
+    assert backoff_delay(0, CallPolicy(max_delay_seconds=30), hint=60.0) == 60.0
+
+
+class RateLimitedError(Exception):
+    status_code = 429
+
+
+class FlakyClient:
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.responses = self
+
+    def create(self, **kwargs: object) -> object:
+        if self.failures:
+            self.failures -= 1
+            raise RateLimitedError("slow down")
+        return type("Resp", (), {"output_text": "done", "usage": None})()
+
+
+def test_provider_retries_then_gives_up_gracefully(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    reset_registry()
+    policy = CallPolicy(max_attempts=3, base_delay_seconds=0.0)
+    monkeypatch.setattr(llm, "_build_client", lambda key, settings: FlakyClient(2))
+    assert OpenAIProvider("gpt-4o-mini", policy=policy).complete("hi") == "done"
+    reset_registry()
+    monkeypatch.setattr(llm, "_build_client", lambda key, settings: FlakyClient(5))
+    with pytest.raises(LLMTransientError):
+        OpenAIProvider("gpt-4o-mini", policy=policy).complete("hi")
+    reset_registry()
+
+
+class StreamingClient:
+    def __init__(self) -> None:
+        self.responses = self
+
+    def create(self, **kwargs: object) -> object:
+        usage = type("Usage", (), {"total_tokens": 500})()
+        done = type("Resp", (), {"usage": usage})()
+        return iter(
+            [
+                type("Event", (), {"type": "response.output_text.delta", "delta": "he"})(),
+                type("Event", (), {"type": "response.output_text.delta", "delta": "llo"})(),
+                type("Event", (), {"type": "response.completed", "response": done})(),
+            ]
+        )
+
+
+def test_stream_settles_usage_from_completed_event(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    reset_registry()
+    policy = CallPolicy(tpm=10_000)
+    monkeypatch.setattr(llm, "_build_client", lambda key, settings: StreamingClient())
+    settled: list[int] = []
+    limiter = llm.shared_limiter("gpt-4o-mini", policy)
+    monkeypatch.setattr(limiter, "settle", settled.append)
+    provider = OpenAIProvider("gpt-4o-mini", policy=policy)
+    assert "".join(provider.stream("hi")) == "hello"
+    assert settled == [500 - provider.estimator.count("hi")]
+    reset_registry()
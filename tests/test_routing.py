@@ -0,0 +1,48 @@
+import pytest
+
+from data_swarm.config import DEFAULT_CONFIG
+from data_swarm.llm import LLMTimeoutError, LLMUnavailableError
+from data_swarm.routing import Route, RoutedProvider
+
+
+class NamedProvider:
+    def __init__(self, model: str, error: Exception | None = None) -> None:
+        self.model = model
+        self.error = error
+        self.calls = 0
+
+    def complete(self, prompt: str) -> str:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.model
+
+
+def test_route_reads_role_then_default_then_llm() -> None:
+    llm = {**DEFAULT_CONFIG["llm"], "routing": {**DEFAULT_CONFIG["llm"]["routing"], "default": {"timeout_seconds": 5}}}
+    codegen = Route.from_config(llm, "codegen")
+    assert (codegen.model, codegen.fallback_model, codegen.timeout_seconds) == ("gpt-4o", "gpt-4o-mini", 120.0)
+    triage = Route.from_config(llm, "triage")
+    assert (triage.model, triage.timeout_seconds, triage.fallback_model) == ("gpt-4o-mini", 5.0, "")
+
+
+def test_budgets_route_to_fallback() -> None:
+    routes: list[tuple[str, str]] = []
+    primary, cheap = NamedProvider("big"), NamedProvider("small")
+    provider = RoutedProvider(
+        Route("big", max_prompt_tokens=50, token_budget=60), primary, cheap, lambda m, r: routes.append((m, r))
+    )
+    assert provider.complete("short prompt") == "big"
+    assert provider.complete("word " * 100) == "small"
+    assert provider.complete("another short prompt " * 5) == "small"
+    assert routes == [("small", "max_prompt_tokens"), ("small", "token_budget")]
+    assert RoutedProvider(Route("big", max_prompt_tokens=1), primary).complete("word " * 100) == "big"
+
+
+def test_timeout_falls_back_but_other_errors_propagate() -> None:
+    provider = RoutedProvider(Route("big"), NamedProvider("big", LLMTimeoutError("slow")), NamedProvider("small"))
+    assert provider.complete("prompt") == "small" and provider.last_reason == "LLMTimeoutError"
+    assert list(provider.stream("prompt")) == ["small"]
+    broken = RoutedProvider(Route("big"), NamedProvider("big", LLMUnavailableError("no key")), NamedProvider("small"))
+    with pytest.raises(LLMUnavailableError):
+        broken.complete("prompt")
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from data_swarm.projects.meridian_aux.agents.retriever import RetrieverAgent
+from data_swarm.projects.meridian_aux.tools.indexer import build_index
+
+MODEL = '''"""Model module."""
+
+import math
+
+SCALE = 2
+
+
+def unused_helper():
+    return "x" * 1000
+
+
+class Model:
+    def fit(self):
+        return math.sqrt(SCALE)
+
+    def predict(self):
+        return 0
+
+
+@staticmethod
+def transform(value):
+    return value * SCALE
+'''
+
+
+def test_retriever_extracts_header_and_relevant_symbols(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    (repo / "model.py").write_text(MODEL, encoding="utf-8")
+    (repo / "main.py").write_text("from model import transform\n", encoding="utf-8")
+    idx = tmp_path / "index.sqlite"
+    build_index(idx, [repo])
+    files = [("meridian", "main.py"), ("meridian", "model.py")]
+    hits = [{"repo": "meridian", "file_path": "model.py", "symbol": "fit"}]
+
+    snippets, chars, _ = RetrieverAgent().retrieve({"meridian": repo}, files, tmp_path / "out", 10_000, idx, hits)
+
+    text = snippets[1].read_text(encoding="utf-8")
+    assert '"""Model module."""' in text and "import math" in text and "SCALE = 2" in text
+    assert "class Model:" in text and "def fit(self):" in text
+    assert "@staticmethod\ndef transform(value):" in text
+    assert "unused_helper" not in text and "def predict" not in text
+    assert chars < len(MODEL) + len("from model import transform\n")
+
+
+def test_retriever_copies_whole_file_without_index(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    (repo / "model.py").write_text(MODEL, encoding="utf-8")
+
+    files = [("meridian", "model.py")]
+    snippets, chars, _ = RetrieverAgent().retrieve({"meridian": repo}, files, tmp_path / "out", 10_000)
+    assert snippets[0].read_text(encoding="utf-8") == MODEL
+    assert chars == len(MODEL)
@@ -0,0 +1,94 @@
+import subprocess
+from pathlib import Path
+
+from data_swarm.projects.meridian_aux.agents.debugger import DebuggerAgent
+from data_swarm.projects.meridian_aux.tools.speculative import evaluate_candidates, rank_passing
+
+SMALL_FIX = """--- a/calc.py
++++ b/calc.py
+@@ -1,2 +1,2 @@
+ def add(a, b):
+-    return a - b
++    return a + b
+"""
+
+LARGE_FIX = """--- a/calc.py
++++ b/calc.py
+@@ -1,2 +1,3 @@
+ def add(a, b):
+-    return a - b
++    total = a + b
++    return total
+"""
+
+WRONG_FIX = SMALL_FIX.replace("a + b", "a * b")
+STALE = SMALL_FIX.replace("a - b", "a / b")
+
+
+def _repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "meridian_aux"
+    repo.mkdir()
+    (repo / "calc.py").write_text("def add(a, b):\n    return a - b\n", encoding="utf-8")
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)
+    subprocess.run(["git", "-C", str(repo), "add", "."], check=True)
+    git = ["git", "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@example.com"]
+    subprocess.run([*git, "commit", "-qm", "init"], check=True)
+    (repo / "test_calc.py").write_text("from calc import add\n\n\ndef test_add():\n    assert add(2, 3) == 5\n")
+    return repo
+
+
+def test_candidates_run_in_isolated_worktrees_and_rank_by_diff_size(tmp_path: Path) -> None:
+    repo = _repo(tmp_path)
+    snippet = tmp_path / "snippet.py"
+    snippet.write_text("print('ok')\n", encoding="utf-8")
+    candidates = [
+        {"patch": LARGE_FIX, "notes": "large"},
+        {"patch": WRONG_FIX, "notes": "wrong"},
+        {"patch": STALE, "notes": "stale"},
+        {"patch": "", "notes": "nothing"},
+        {"patch": SMALL_FIX, "notes": "small", "probe_snippet": "import os\nassert os.path.exists('calc.py')\n"},
+    ]
+    results = evaluate_candidates(repo, candidates, snippet, tmp_path / "candidates")
+    by_note = {r.notes: r for r in results}
+    assert set(by_note) == {"large", "wrong", "stale", "small"}
+    assert by_note["wrong"].applied and by_note["wrong"].pytest_exit != 0
+    assert not by_note["stale"].applied and by_note["stale"].error
+    assert [r.notes for r in rank_passing(results)] == ["small", "large"]
+    assert "a - b" in (repo / "calc.py").read_text(encoding="utf-8")
+    assert (tmp_path / "candidates" / "candidate_5" / "snippet.py").exists()
+    listed = subprocess.run(["git", "-C", str(repo), "worktree", "list"], capture_output=True, text=True, check=True)
+    assert len(listed.stdout.splitlines()) == 1
+
+
+def test_probe_snippets_import_the_patched_worktree(tmp_path: Path) -> None:
+    repo = _repo(tmp_path)
+    probe = "import calc\nassert calc.add(2, 3) == 5\n"
+    candidates = [
+        {"patch": SMALL_FIX, "notes": "small", "probe_snippet": probe},
+        {"patch": WRONG_FIX, "notes": "wrong"},
+    ]
+    snippet = tmp_path / "snippet.py"
+    snippet.write_text(probe, encoding="utf-8")
+    by_note = {r.notes: r for r in evaluate_candidates(repo, candidates, snippet, tmp_path / "candidates")}
+    assert by_note["small"].snippet_exit == 0
+    assert by_note["wrong"].snippet_exit != 0
+
+
+class CountingProvider:
+    model = "gpt-4o-mini"
+
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def complete(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return f"patch: ''\nnotes: candidate {len(self.prompts)}\n"
+
+
+def test_propose_many_requests_distinct_prompts(tmp_path: Path) -> None:
+    prompt_path = tmp_path / "debugger.md"
+    prompt_path.write_text("Return YAML.", encoding="utf-8")
+    provider = CountingProvider()
+    proposals = DebuggerAgent("gpt-4o-mini", provider=provider).propose_many(prompt_path, "Traceback", 3)
+    assert len(proposals) == 3 and len(set(provider.prompts)) == 3
+    assert all(p.startswith("Return YAML.") for p in provider.prompts)
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from data_swarm.projects.meridian_aux.agents.codegen import CodegenAgent
+from data_swarm.projects.meridian_aux.tools.stream_parser import SectionStreamParser
+
+PAYLOAD = """```yaml
+patch: |
+  --- a/x.py
+  +++ b/x.py
+  @@ -1 +1 @@
+  -a = 1
+  +a = 2
+tests_added:
+  - tests/test_x.py
+snippet: |
+  print("ok")
+notes: bump a
+```
+"""
+
+
+def test_sections_complete_in_stream_order() -> None:
+    seen: list[tuple[str, int]] = []
+    parser = SectionStreamParser(["patch", "tests_added", "snippet", "notes"], lambda k, _: seen.append((k, fed)))
+    fed = 0
+    for fed in range(0, len(PAYLOAD), 7):
+        parser.feed(PAYLOAD[fed : fed + 7])
+    parser.close()
+    assert [k for k, _ in seen] == ["patch", "tests_added", "snippet", "notes"]
+    assert seen[0][1] < PAYLOAD.index("notes:")
+    assert parser.sections["patch"].startswith("--- a/x.py") and parser.sections["tests_added"] == ["tests/test_x.py"]
+
+
+class StreamingProvider:
+    model = "gpt-4o-mini"
+
+    def stream(self, prompt: str):
+        body = "".join(line for line in PAYLOAD.splitlines(keepends=True) if not line.startswith("```"))
+        for i in range(0, len(body), 5):
+            yield body[i : i + 5]
+
+
+def test_codegen_streams_sections_and_returns_full_payload(tmp_path: Path) -> None:
+    prompt = tmp_path / "codegen.md"
+    prompt.write_text("Return YAML.", encoding="utf-8")
+    seen: list[str] = []
+    result = CodegenAgent("gpt-4o-mini", provider=StreamingProvider()).generate(
+        prompt, "context", on_section=lambda key, _: seen.append(key)
+    )
+    assert seen == ["patch", "tests_added", "snippet", "notes"]
+    assert result["notes"] == "bump a" and "+a = 2" in result["patch"]
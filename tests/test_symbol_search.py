@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from data_swarm.projects.meridian_aux.tools.indexer import build_index, search_index, split_identifier
+
+
+def test_split_identifier_handles_snake_and_camel_case() -> None:
+    assert split_identifier("build_index") == ["build", "index"]
+    assert split_identifier("HTTPResponseParser") == ["http", "response", "parser"]
+    assert split_identifier("pkg.subMod") == ["pkg", "sub", "mod"]
+
+
+def test_search_ranks_symbol_matches_above_docstring_matches(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    (repo / "notes.py").write_text(
+        'def unrelated():\n    """Mentions the adstock transform in passing."""\n',
+        encoding="utf-8",
+    )
+    (repo / "media.py").write_text("class AdstockTransform:\n    pass\n", encoding="utf-8")
+    idx = tmp_path / "index.sqlite"
+    build_index(idx, [repo])
+
+    hits = search_index(idx, "adstock transform")
+    assert [h["symbol"] for h in hits] == ["AdstockTransform", "unrelated"]
+
+
+def test_search_tracks_incremental_changes(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    (repo / "a.py").write_text("def fit_model():\n    return 1\n", encoding="utf-8")
+    idx = tmp_path / "index.sqlite"
+    build_index(idx, [repo])
+    assert search_index(idx, "fit")[0]["symbol"] == "fit_model"
+
+    (repo / "a.py").write_text("def predict_model():\n    return 2\n", encoding="utf-8")
+    build_index(idx, [repo])
+    assert search_index(idx, "fit") == []
+    assert search_index(idx, "predict")[0]["symbol"] == "predict_model"
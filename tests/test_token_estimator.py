@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from data_swarm.projects.meridian_aux.agents.codegen import CodegenAgent
+from data_swarm.projects.meridian_aux.tools.retriever import collect_snippets
+from data_swarm.tokens import _CACHE, TokenEstimator, model_family
+
+PROSE = "The model estimates how much each channel contributes to sales over time. " * 20
+CODE = "def f(x: dict[str, int]) -> list[int]:\n    return [x[k] ** 2 for k in sorted(x) if k != '_']\n" * 20
+
+
+def test_model_family_and_code_density() -> None:
+    assert model_family("gpt-4o-mini") == "o200k"
+    assert model_family("gpt-4-turbo") == "cl100k"
+    assert model_family("some-local-model") == "default"
+    est = TokenEstimator("gpt-4o-mini")
+    assert est.count(CODE) / len(CODE) > est.count(PROSE) / len(PROSE)
+    assert 0.15 < est.count(PROSE) / len(PROSE) < 0.3
+
+
+def test_counts_are_cached_per_content_hash(tmp_path: Path) -> None:
+    est = TokenEstimator("gpt-4o")
+    path = tmp_path / "a.py"
+    path.write_text(CODE, encoding="utf-8")
+    before = len(_CACHE)
+    assert est.count_file(path) == est.count(CODE)
+    assert len(_CACHE) <= before + 1
+    truncated = est.truncate(CODE, 50)
+    assert est.count(truncated) <= 50 and truncated.endswith("[truncated to fit token budget]\n")
+
+
+def test_snippets_and_prompt_respect_token_budgets(tmp_path: Path) -> None:
+    repo = tmp_path / "meridian"
+    repo.mkdir()
+    (repo / "a.py").write_text(CODE, encoding="utf-8")
+    (repo / "b.py").write_text(PROSE, encoding="utf-8")
+    est = TokenEstimator("gpt-4o")
+    files = [("meridian", "a.py"), ("meridian", "b.py")]
+    report = tmp_path / "report.md"
+    snippets, _, _ = collect_snippets(
+        {"meridian": repo},
+        files,
+        tmp_path / "out",
+        10**6,
+        report_path=report,
+        max_tokens=est.count(CODE),
+        estimator=est,
+    )
+    assert [p.name for p in snippets] == ["00_meridian__a.py"]
+    assert "tokens" in report.read_text(encoding="utf-8")
+
+    prompt_path = tmp_path / "codegen.md"
+    prompt_path.write_text("Return YAML.", encoding="utf-8")
+    context = PROSE.replace(". ", ".\n")
+    prompt = CodegenAgent("gpt-4o", max_tokens=10**6).assemble(prompt_path, context, evidence=snippets)
+    assert "## Evidence: 00_meridian__a.py" in prompt
+    agent = CodegenAgent("gpt-4o", max_tokens=60)
+    prompt = agent.assemble(prompt_path, context, evidence=snippets)
+    assert prompt.startswith("Return YAML.") and "truncated to fit token budget" in prompt
+    assert "## Evidence" not in prompt and est.count(prompt) <= 60 + 2